@@ -1,9 +1,11 @@
+import time
+rerun_started = time.perf_counter()
+
 import streamlit as st
-import numpy as np
-import matplotlib.pyplot as plt
 import json
-from opamp_physics import OpAmpSolver
-# Force reload for physics update
+from profiling import StageTimer, ENV_LOG_PATH, DEFAULT_LOG_PATH, start_profile, profile_report, record_first_render, first_renders, append_record
+# numpy, matplotlib and the physics modules are imported by the Lab page only,
+# so Home and Tutorial render without paying for them
 
 st.set_page_config(
     layout="wide", 
@@ -229,6 +231,22 @@ elif st.session_state.page == 'Tutorial':
 elif st.session_state.page == 'Lab':
     st.title("🔬 Op-Amp Lab Explorer")
     
+    # Per-stage timing for this rerun (controls live in the debug panel at the bottom of the sidebar)
+    timer = StageTimer(trace_memory=st.session_state.get("debug_trace_memory", False))
+    profiler = start_profile() if st.session_state.get("debug_profile_rerun") else None
+    
+    # Heavy imports, paid once per process on the first Lab render
+    with timer.stage("imports"):
+        import numpy as np
+        import matplotlib.pyplot as plt
+        from opamp_physics import ac_analysis, gain_curve, solve_batch
+        from solver_cache import cached_solver, cached_waveforms
+        from spectrum import amplitude_sweep
+        from resistor_library import series_values, best_pairs
+        from decimation import decimate
+        from visualizer import render_animated_schematic
+        from recompute import RecomputeGraph, figure_png
+    
     # --- Sidebar Controls ---
     st.sidebar.header("Circuit Configuration")
     
@@ -322,6 +340,9 @@ elif st.session_state.page == 'Lab':
     
     # Waveform Selection
     wave_type = st.sidebar.selectbox("Waveform Type", ["Sine", "Square", "Triangle"])
+    sim_points = st.sidebar.select_slider("Simulation Points", ["Auto", 1000, 10000, 100000, 1000000], value="Auto",
+                                          help="Auto picks whole samples per period from the waveform's harmonics and the RC time constant. "
+                                               "Plots are decimated to screen resolution, so more points cost simulation time only")
     
     v_in_amp = st.sidebar.slider("Input Amplitude (V)", 0.1, 10.0, 1.0)
     v_in_dc = st.sidebar.slider("Input DC Offset (V)", -5.0, 5.0, 0.0)
@@ -329,11 +350,131 @@ elif st.session_state.page == 'Lab':
     st.sidebar.markdown("---")
     st.sidebar.subheader("Live Simulation")
     live_vin = st.sidebar.slider("Instantaneous Vin (for Schematic)", -v_in_amp, v_in_amp, v_in_dc)
+    live_scope = st.sidebar.checkbox("📡 Live Scope", help="Streams the output to a canvas over a local WebSocket; "
+                                     "frequency and amplitude can be changed on the scope itself without a rerun")
 
-    # Global Solver for Schematic
-    solver = OpAmpSolver(config_type, r_in, r_f, live_vin, v_cc, C=cap_val*1e-6, V_in2=v_in2_amp if config_type in ["Summing Amplifier", "Difference Amplifier"] else 0, R_in2=r_in2)
-    solver.calculate_parameters()
-    state = solver.get_state()
+    # --- Dependency Graph ---
+    # Every derived value (operating point, waveforms, sweeps, figures) is a node that names the
+    # inputs it reads. Results live in session state and a node is recomputed (and timed) only
+    # when one of its inputs or upstream nodes changed, e.g. moving A_OL redraws the gain plot only.
+    graph = RecomputeGraph(st.session_state, timer=timer)
+    graph.set_inputs(config_type=config_type, r_in=r_in, r_f=r_f, r_in2=r_in2, c=cap_val*1e-6, v_cc=v_cc,
+                     v_in_amp=v_in_amp, v_in2=v_in2_amp, live_vin=live_vin, wave_type=wave_type, sim_points=sim_points)
+    
+    def operating_point(config_type, r_in, r_f, live_vin, v_cc, c, v_in2, r_in2):
+        # Schematic solver at the live Vin (shared, memoized across reruns and sessions)
+        v_in2 = v_in2 if config_type in ["Summing Amplifier", "Difference Amplifier"] else 0
+        return cached_solver(config_type, r_in, r_f, live_vin, v_cc, C=c, V_in2=v_in2, R_in2=r_in2).get_state()
+    
+    def kcl(operating_point):
+        return {"I_in": operating_point["I_in"], "I_f": operating_point["I_f"], "V_minus": operating_point["V_minus"],
+                "error": operating_point["I_in"] - operating_point["I_f"]}
+    
+    def waveforms(config_type, r_in, r_f, v_in_amp, v_cc, c, v_in2, r_in2, wave_type, sim_points):
+        wave_solver = cached_solver(config_type, r_in, r_f, v_in_amp, v_cc, C=c, V_in2=v_in2, R_in2=r_in2)
+        t, vin_wave, vout_wave = cached_waveforms(config_type, r_in, r_f, v_in_amp, v_cc, C=c, V_in2=v_in2, R_in2=r_in2,
+                                                  freq=1.0, duration=2.0, points=None if sim_points == "Auto" else sim_points,
+                                                  wave_type=wave_type)
+        return {"t": t, "vin": vin_wave, "vout": vout_wave, "actual_gain": wave_solver.actual_gain}
+    
+    def waveform_figure(config_type, wave_type, v_in_amp, v_cc, phase_lock, waveforms):
+        fig, ax = plt.subplots(figsize=(10, 4))
+        # Two samples per horizontal pixel is all the line can show; min/max keeps peaks and clip edges
+        display_points = 2 * int(ax.bbox.width)
+        ax.plot(*decimate(waveforms["t"], waveforms["vin"], display_points), label="Vin", color="blue", alpha=0.7, linewidth=2)
+        ax.plot(*decimate(waveforms["t"], waveforms["vout"], display_points), label="Vout", color="red", alpha=0.7, linewidth=2)
+        ax.set_xlabel("Time (s)", fontsize=12)
+        ax.set_ylabel("Voltage (V)", fontsize=12)
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=11)
+        ax.set_title(f"{config_type} - {wave_type} Wave Response", fontsize=13, fontweight='bold')
+        
+        if phase_lock and config_type == "Inverting" and wave_type == "Sine":
+            peak_t = 0.25
+            peak_vin = v_in_amp
+            trough_vout = -v_in_amp * abs(waveforms["actual_gain"])
+            if abs(trough_vout) > v_cc: trough_vout = -v_cc if trough_vout < 0 else v_cc
+            
+            ax.plot([peak_t, peak_t], [peak_vin, trough_vout], 'k--', linewidth=1.5)
+            ax.scatter([peak_t], [peak_vin], color='blue', zorder=5)
+            ax.scatter([peak_t], [trough_vout], color='red', zorder=5)
+            ax.text(peak_t + 0.05, (peak_vin+trough_vout)/2, "180° Shift", rotation=90, verticalalignment='center')
+        return figure_png(fig)
+    
+    def distortion(config_type, r_in, r_f, v_cc, c, v_in2, r_in2, wave_type):
+        # Sweep the input amplitude and measure how clipping adds harmonics
+        sweep_amps = np.linspace(0.1, 10.0, 500)
+        dist = amplitude_sweep(config_type, r_in, r_f, v_cc, sweep_amps, C=c, V_in2=v_in2, R_in2=r_in2, wave_type=wave_type)
+        return {"amps": sweep_amps, **dist}
+    
+    def distortion_figure(v_in_amp, distortion):
+        sweep_amps, onset = distortion["amps"], distortion["clipping_onset"]
+        current = np.argmin(np.abs(sweep_amps - v_in_amp))
+        fig_thd, ax_thd = plt.subplots(figsize=(8, 3))
+        ax_thd.plot(sweep_amps, distortion["thd"] * 100, color="purple", linewidth=2)
+        ax_thd.scatter([sweep_amps[current]], [distortion["thd"][current] * 100], color='red', s=80, zorder=5, label="Current Amplitude")
+        if np.isfinite(onset):
+            ax_thd.axvline(onset, color='gray', linestyle='--', label="Clipping Onset")
+        ax_thd.set_xlabel("Input Amplitude (V)")
+        ax_thd.set_ylabel("THD (%)")
+        ax_thd.grid(True, alpha=0.3)
+        ax_thd.legend()
+        return figure_png(fig_thd)
+    
+    def feedback_point(config_type, r_in, r_f, v_in_amp, v_cc, a_ol, r_in2):
+        beta_solver = cached_solver(config_type, r_in, r_f, v_in_amp, v_cc, A_ol=a_ol, R_in2=r_in2)
+        return {"beta": beta_solver.beta, "noise_gain": beta_solver.noise_gain,
+                "ideal_gain": beta_solver.ideal_gain, "actual_gain": beta_solver.actual_gain}
+    
+    def feedback_sweep(config_type, r_in, r_f, r_in2):
+        # Whole A_OL sweep in one vectorized call; it does not depend on the A_OL slider
+        aol_range = np.logspace(0, 6, 1000)
+        return aol_range, np.abs(gain_curve(config_type, r_in, r_f, aol_range, R_in2=r_in2))
+    
+    def feedback_figure(a_ol, feedback_point, feedback_sweep):
+        aol_range, gains = feedback_sweep
+        fig_beta, ax_beta = plt.subplots(figsize=(6, 3))
+        ax_beta.semilogx(aol_range, gains, label="Actual Gain")
+        ax_beta.axhline(abs(feedback_point["ideal_gain"]), color='g', linestyle='--', label="Ideal Gain")
+        ax_beta.scatter([a_ol], [abs(feedback_point["actual_gain"])], color='red', s=100, zorder=5, label="Current Point")
+        ax_beta.set_xlabel("Open Loop Gain (A_OL)")
+        ax_beta.set_ylabel("Closed Loop Gain")
+        ax_beta.legend()
+        ax_beta.grid(True, which="both", alpha=0.3)
+        return figure_png(fig_beta)
+    
+    def frequency_response(config_type, r_in, r_f, c, r_in2, gbw):
+        freqs = np.logspace(0, 8, 2000)
+        return {"freqs": freqs, **ac_analysis(config_type, freqs, r_in, r_f, C=c, R_in2=r_in2, GBW=gbw)}
+    
+    def bode_figure(frequency_response):
+        freqs, bw = frequency_response["freqs"], frequency_response["bandwidth_3db"]
+        fig_bode, (ax_mag, ax_phase) = plt.subplots(2, 1, figsize=(8, 5), sharex=True)
+        ax_mag.semilogx(freqs, frequency_response["magnitude_db"], color="purple", linewidth=2)
+        if np.isfinite(bw):
+            ax_mag.axvline(bw, color='r', linestyle='--', label=f"-3 dB @ {bw:,.0f} Hz")
+            ax_mag.legend()
+        ax_mag.set_ylabel("Magnitude (dB)")
+        ax_mag.grid(True, which="both", alpha=0.3)
+        ax_phase.semilogx(freqs, frequency_response["phase_deg"], color="orange", linewidth=2)
+        ax_phase.set_xlabel("Frequency (Hz)")
+        ax_phase.set_ylabel("Phase (°)")
+        ax_phase.grid(True, which="both", alpha=0.3)
+        return figure_png(fig_bode)
+    
+    graph.node("operating_point", operating_point, inputs=["config_type", "r_in", "r_f", "live_vin", "v_cc", "c", "v_in2", "r_in2"])
+    graph.node("kcl", kcl, deps=["operating_point"])
+    graph.node("waveforms", waveforms, inputs=["config_type", "r_in", "r_f", "v_in_amp", "v_cc", "c", "v_in2", "r_in2", "wave_type", "sim_points"])
+    graph.node("waveform_figure", waveform_figure, inputs=["config_type", "wave_type", "v_in_amp", "v_cc", "phase_lock"], deps=["waveforms"])
+    graph.node("distortion", distortion, inputs=["config_type", "r_in", "r_f", "v_cc", "c", "v_in2", "r_in2", "wave_type"])
+    graph.node("distortion_figure", distortion_figure, inputs=["v_in_amp"], deps=["distortion"])
+    graph.node("feedback_point", feedback_point, inputs=["config_type", "r_in", "r_f", "v_in_amp", "v_cc", "a_ol", "r_in2"])
+    graph.node("feedback_sweep", feedback_sweep, inputs=["config_type", "r_in", "r_f", "r_in2"])
+    graph.node("feedback_figure", feedback_figure, inputs=["a_ol"], deps=["feedback_point", "feedback_sweep"])
+    graph.node("frequency_response", frequency_response, inputs=["config_type", "r_in", "r_f", "c", "r_in2", "gbw"])
+    graph.node("bode_figure", bode_figure, deps=["frequency_response"])
+    
+    state = graph.get("operating_point")
 
     # Export Configuration
     st.sidebar.markdown("---")
@@ -345,8 +486,10 @@ elif st.session_state.page == 'Lab':
             "V_cc": v_cc,
             "V_in_amp": v_in_amp,
             "V_in_dc": v_in_dc,
-            "Wave_Type": wave_type
+            "Wave_Type": wave_type,
         }
+        if sim_points != "Auto":
+            config_data["points"] = sim_points
         st.sidebar.download_button(
             "Download JSON",
             data=json.dumps(config_data, indent=2),
@@ -354,8 +497,22 @@ elif st.session_state.page == 'Lab':
             mime="application/json"
         )
 
+    # Animated schematic: the whole live Vin range solved in one batch and played back by the browser
+    if st.sidebar.button("🎞️ Export Vin Sweep Animation"):
+        with timer.stage("animation_export"):
+            sweep_vin = np.linspace(-v_in_amp, v_in_amp, 61)
+            sweep_vin = np.concatenate([sweep_vin, sweep_vin[-2:0:-1]]) # Up and back down, so the loop is seamless
+            sweep = solve_batch(config_type, r_in, r_f, sweep_vin, v_cc, C=cap_val*1e-6, V_in2=v_in2_amp if config_type in ["Summing Amplifier", "Difference Amplifier"] else 0, R_in2=r_in2)
+            animation = render_animated_schematic(config_type, sweep_vin, np.broadcast_to(sweep["V_out"], sweep_vin.shape))
+        st.sidebar.download_button(
+            "Download Animated SVG",
+            data=animation,
+            file_name="opamp_vin_sweep.svg",
+            mime="image/svg+xml"
+        )
+
     # --- Tabs ---
-    tab1, tab2, tab3 = st.tabs(["1. Configuration Explorer", "2. The Feedback Loop", "3. The Summing Junction"])
+    tab1, tab2, tab3, tab4 = st.tabs(["1. Configuration Explorer", "2. The Feedback Loop", "3. The Summing Junction", "4. Frequency Response"])
 
     with tab1:
         st.header("Phase Shift & Gain")
@@ -402,39 +559,49 @@ elif st.session_state.page == 'Lab':
         
         # Waveform Analysis below
         st.subheader("Waveform Analysis")
+
+        if live_scope:
+            with timer.stage("live_scope"):
+                import uuid
+                import live_scope as scope
+                try:
+                    server = scope.get_server()
+                except RuntimeError as e:
+                    st.warning(f"Live scope unavailable: {e}")
+                else:
+                    # One channel per browser session; the server applies new settings on its next block
+                    channel = st.session_state.setdefault("scope_channel", uuid.uuid4().hex)
+                    server.publish(channel, config_type=config_type, R_in=r_in, R_f=r_f, V_in=v_in_amp, V_cc=v_cc,
+                                   C=cap_val*1e-6, V_in2=v_in2_amp, R_in2=r_in2, wave_type=wave_type)
+                    st.iframe(scope.scope_html(server, channel), height=360)
+                    st.caption("Live scope: blue = Vin, red = Vout. Frames are dropped, not queued, when the browser falls behind.")
         phase_lock = st.checkbox("Phase Lock Visualization (Freeze & Show Shift)") if config_type == "Inverting" else False
             
-        # Generate Waveforms
-        wave_solver = OpAmpSolver(config_type, r_in, r_f, v_in_amp, v_cc, C=cap_val*1e-6, V_in2=v_in2_amp, R_in2=r_in2)
-        wave_solver.calculate_parameters()
-        t, vin_wave, vout_wave = wave_solver.generate_waveforms(freq=1.0, duration=2.0, wave_type=wave_type)
-        
-        fig, ax = plt.subplots(figsize=(10, 4))
-        ax.plot(t, vin_wave, label="Vin", color="blue", alpha=0.7, linewidth=2)
-        ax.plot(t, vout_wave, label="Vout", color="red", alpha=0.7, linewidth=2)
-        ax.set_xlabel("Time (s)", fontsize=12)
-        ax.set_ylabel("Voltage (V)", fontsize=12)
-        ax.grid(True, alpha=0.3)
-        ax.legend(fontsize=11)
-        ax.set_title(f"{config_type} - {wave_type} Wave Response", fontsize=13, fontweight='bold')
+        graph.set_inputs(phase_lock=phase_lock)
         
         if phase_lock and config_type == "Inverting" and wave_type == "Sine":
-            peak_t = 0.25
-            peak_vin = v_in_amp
-            trough_vout = -v_in_amp * abs(wave_solver.actual_gain)
-            if abs(trough_vout) > v_cc: trough_vout = -v_cc if trough_vout < 0 else v_cc
-            
-            ax.plot([peak_t, peak_t], [peak_vin, trough_vout], 'k--', linewidth=1.5)
-            ax.scatter([peak_t], [peak_vin], color='blue', zorder=5)
-            ax.scatter([peak_t], [trough_vout], color='red', zorder=5)
-            ax.text(peak_t + 0.05, (peak_vin+trough_vout)/2, "180° Shift", rotation=90, verticalalignment='center')
-            
             st.caption("Vertical line connects Input Peak to Output Trough, demonstrating inversion.")
         
         if config_type == "Voltage Follower":
             st.success("✅ **Perfect Unity Gain:** Output follows input with no phase shift and no attenuation!")
 
-        st.pyplot(fig)
+        st.image(graph.get("waveform_figure"), width="stretch")
+        
+        # Distortion: sweep the input amplitude and measure how clipping adds harmonics
+        st.subheader("Distortion Analysis")
+        dist = graph.get("distortion")
+        sweep_amps = dist["amps"]
+        current = np.argmin(np.abs(sweep_amps - v_in_amp))
+        
+        dist_col1, dist_col2 = st.columns([1, 2])
+        with dist_col1:
+            st.metric("THD at Current Amplitude", f"{dist['thd'][current]*100:.3f} %")
+            st.metric("SINAD", f"{dist['sinad_db'][current]:.1f} dB")
+            onset = dist["clipping_onset"]
+            st.metric("Clipping Onset", f"{onset:.2f} V" if np.isfinite(onset) else "No clipping")
+            st.caption("THD = harmonic power relative to the fundamental (Blackman-Harris windowed FFT).")
+        with dist_col2:
+            st.image(graph.get("distortion_figure"), width="stretch")
 
     with tab2:
         st.header("The Feedback Loop (Beta)")
@@ -451,36 +618,25 @@ elif st.session_state.page == 'Lab':
             a_ol = 10**a_ol_log
             st.metric("Current A_OL", f"{int(a_ol):,}")
             
-            beta = r_in / (r_in + r_f) if r_f > 0 else 0
-            st.metric("Feedback Factor (Beta)", f"{beta:.4f}")
-            st.caption(f"Beta = Rin / (Rin + Rf)")
+            graph.set_inputs(a_ol=a_ol)
+            feedback = graph.get("feedback_point")
             
-        with col_beta2:
-            beta_solver = OpAmpSolver(config_type, r_in, r_f, v_in_amp, v_cc, A_ol=a_ol)
-            beta_solver.calculate_parameters()
+            st.metric("Feedback Factor (Beta)", f"{feedback['beta']:.4f}")
+            st.metric("Noise Gain (1/Beta)", f"{feedback['noise_gain']:.2f}")
+            if config_type == "Summing Amplifier":
+                st.caption(f"Beta = (R1 || R2) / ((R1 || R2) + Rf)")
+            elif config_type == "Integrator":
+                st.caption(f"Beta = 0 at DC (capacitor open, no feedback)")
+            else:
+                st.caption(f"Beta = Rin / (Rin + Rf)")
             
-            ideal_gain = beta_solver.ideal_gain
-            actual_gain = beta_solver.actual_gain
+        with col_beta2:
+            ideal_gain = feedback["ideal_gain"]
+            actual_gain = feedback["actual_gain"]
             
             st.subheader("Gain Stability")
             
-            aol_range = np.logspace(0, 6, 100)
-            gains = []
-            for a in aol_range:
-                s = OpAmpSolver(config_type, r_in, r_f, v_in_amp, v_cc, A_ol=a)
-                s.calculate_parameters()
-                gains.append(abs(s.actual_gain))
-                
-            fig_beta, ax_beta = plt.subplots(figsize=(6, 3))
-            ax_beta.semilogx(aol_range, gains, label="Actual Gain")
-            ax_beta.axhline(abs(ideal_gain), color='g', linestyle='--', label="Ideal Gain")
-            ax_beta.scatter([a_ol], [abs(actual_gain)], color='red', s=100, zorder=5, label="Current Point")
-            ax_beta.set_xlabel("Open Loop Gain (A_OL)")
-            ax_beta.set_ylabel("Closed Loop Gain")
-            ax_beta.legend()
-            ax_beta.grid(True, which="both", alpha=0.3)
-            
-            st.pyplot(fig_beta)
+            st.image(graph.get("feedback_figure"), width="stretch")
             
             error = abs(ideal_gain - actual_gain) / abs(ideal_gain) * 100 if ideal_gain != 0 else 0
             st.markdown(f"**Gain Error:** {error:.4f}%")
@@ -492,35 +648,31 @@ elif st.session_state.page == 'Lab':
         
         st.markdown("Zooming in on the Inverting Input (-). According to KCL, currents must sum to zero.")
         
+        kcl_values = graph.get("kcl")
         kcl_col1, kcl_col2, kcl_col3 = st.columns(3)
         
         with kcl_col1:
             st.markdown("### I_in (Entering)")
-            st.markdown(f"<h2 style='color:blue'>{state['I_in']*1000:.3f} mA</h2>", unsafe_allow_html=True)
+            st.markdown(f"<h2 style='color:blue'>{kcl_values['I_in']*1000:.3f} mA</h2>", unsafe_allow_html=True)
             st.caption("From Input Source")
             
         with kcl_col2:
             st.markdown("### Summing Node")
-            st.markdown(f"**Voltage:** {state['V_minus']*1000:.3f} mV")
+            st.markdown(f"**Voltage:** {kcl_values['V_minus']*1000:.3f} mV")
             
         with kcl_col3:
             st.markdown("### I_f (Leaving)")
-            st.markdown(f"<h2 style='color:red'>{state['I_f']*1000:.3f} mA</h2>", unsafe_allow_html=True)
+            st.markdown(f"<h2 style='color:red'>{kcl_values['I_f']*1000:.3f} mA</h2>", unsafe_allow_html=True)
             st.caption("To Output")
 
-        kcl_error = state['I_in'] - state['I_f']
-        st.metric("KCL Error (I_in - I_f)", f"{kcl_error*1e6:.3f} uA")
+        st.metric("KCL Error (I_in - I_f)", f"{kcl_values['error']*1e6:.3f} uA")
         
         st.markdown("---")
         st.subheader("Interactive Challenge: Match the Resistors")
         st.markdown("Target Gain: **-5.0**")
         
-        e24 = [1.0, 1.1, 1.2, 1.3, 1.5, 1.6, 1.8, 2.0, 2.2, 2.4, 2.7, 3.0, 3.3, 3.6, 3.9, 4.3, 4.7, 5.1, 5.6, 6.2, 6.8, 7.5, 8.2, 9.1]
-        multipliers = [100, 1000, 10000, 100000]
-        resistors = []
-        for m in multipliers:
-            resistors.extend([v * m for v in e24])
-        resistors = sorted(list(set(resistors)))
+        # E24 over 100 Ohm - 910 kOhm (prebuilt once per process)
+        resistors = list(series_values("E24", decades=(2, 3, 4, 5)))
         
         c1, c2 = st.columns(2)
         with c1:
@@ -535,3 +687,64 @@ elif st.session_state.page == 'Lab':
             st.success("Correct! You matched the gain.")
         else:
             st.error("Try again. Remember Gain = -Rf/Rin")
+        
+        with st.expander("💡 Hint: closest E24 pairs"):
+            for pair in best_pairs(-5.0, series="E24", tolerance=0.02, k=5, decades=(2, 3, 4, 5)):
+                st.markdown(f"- Rin = {pair['R_in']:,.0f} Ω, Rf = {pair['R_f']:,.0f} Ω → Gain = {pair['gain']:.3f}")
+
+    with tab4:
+        st.header("Frequency Response (Bode Plot)")
+        
+        st.markdown(r"""
+        A real op-amp's open-loop gain rolls off with frequency. With a single-pole model the
+        product $A_{OL} \cdot f$ stays constant: the **Gain-Bandwidth Product (GBW)**.
+        """)
+        
+        bode_col1, bode_col2 = st.columns([1, 2])
+        
+        with bode_col1:
+            gbw_log = st.slider("Gain-Bandwidth Product (Hz) (Log Scale)", 4.0, 8.0, 6.0)
+            gbw = 10**gbw_log
+            st.metric("GBW", f"{gbw/1e6:.2f} MHz")
+            
+            graph.set_inputs(gbw=gbw)
+            bw = graph.get("frequency_response")["bandwidth_3db"]
+            st.metric("-3 dB Bandwidth", f"{bw/1e3:,.2f} kHz" if np.isfinite(bw) else "Beyond sweep")
+            st.caption("Higher closed-loop gain means lower bandwidth: gain × bandwidth ≈ GBW.")
+            
+        with bode_col2:
+            st.image(graph.get("bode_figure"), width="stretch")
+
+    # --- Debug Panel: stage timings for this rerun ---
+    profile_text = profile_report(profiler) if profiler else None
+    timer.stop()
+    log_path = ENV_LOG_PATH or (DEFAULT_LOG_PATH if st.session_state.get("debug_log") else None)
+    if log_path:
+        timer.append_log(log_path, page="Lab", config_type=config_type, wave_type=wave_type)
+    if profile_text:
+        st.session_state.profile_report = profile_text
+
+    st.sidebar.markdown("---")
+    with st.sidebar.expander("🛠 Performance Debug"):
+        st.dataframe(
+            [{"Stage": r["stage"], "ms": round(r["wall_ms"], 2), "Δ blocks": r["alloc_blocks"],
+              **({"Peak KB": round(r["peak_bytes"] / 1024, 1)} if "peak_bytes" in r else {})} for r in timer.records],
+            hide_index=True
+        )
+        st.caption(f"Rerun total: {timer.total_ms():.1f} ms · recomputed {len(graph.recomputed)} of {len(graph.nodes)} nodes")
+        st.checkbox("Trace memory per stage (slower)", key="debug_trace_memory")
+        st.checkbox(f"Append timings to {DEFAULT_LOG_PATH}", key="debug_log", disabled=ENV_LOG_PATH is not None,
+                    help="Always on when OPAMP_TIMING_LOG is set")
+        st.button("🔍 Profile a rerun (cProfile)", key="debug_profile_rerun")
+        if "profile_report" in st.session_state:
+            st.code(st.session_state.profile_report, language="text")
+        st.caption("First render per page in this process (cold = first page served)")
+        st.dataframe(
+            [{"Page": r["page"], "ms": round(r["first_render_ms"], 1), "Cold": r["cold"]} for r in first_renders()],
+            hide_index=True
+        )
+
+# --- Startup budget: how long each page's first render took in this process ---
+first_render = record_first_render(st.session_state.page, rerun_started)
+if first_render and ENV_LOG_PATH:
+    append_record(ENV_LOG_PATH, first_render)
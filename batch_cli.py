@@ -0,0 +1,152 @@
+"""
+Headless batch solver for configurations exported from the Lab Explorer.
+
+    python batch_cli.py designs.jsonl -o results.csv --workers 8 --waveforms-dir waves/
+
+Input is JSON-lines, CSV, or a .json file holding one exported object or a list of them, with
+the "Export Configuration" keys (config_type, R_in, R_f, V_cc, V_in_amp, V_in_dc, Wave_Type) and
+optionally C, V_in2, R_in2, A_ol, freq, duration, points (automatic when absent). Results are
+written as rows are solved. JSON-lines output is strict JSON: non-finite values (such as an
+integrator's infinite noise gain) are written as null.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from opamp_physics import CONFIG_TYPES, OpAmpSolver
+
+NUMERIC_KEYS = ["R_in", "R_f", "V_cc", "V_in_amp", "V_in_dc", "C", "V_in2", "R_in2", "A_ol", "freq", "duration", "points"]
+
+SUMMARY_FIELDS = ["row", "config_type", "Wave_Type", "ideal_gain", "actual_gain", "beta", "noise_gain",
+                  "V_out_dc", "vout_min", "vout_max", "vout_pp", "clip_fraction", "error"]
+
+def read_configs(path):
+    # Yields one dict per configuration without loading the whole file
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, newline="") as f:
+        if ext == ".csv":
+            for row in csv.DictReader(f):
+                yield {k: v for k, v in row.items() if v not in (None, "")}
+        elif ext == ".json":
+            data = json.load(f)
+            yield from (data if isinstance(data, list) else [data])
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def solve_config(args):
+    # Worker: one exported configuration -> summary dict (and optionally a waveform file)
+    index, config, waveforms_dir = args
+    summary = {"row": index, "config_type": config.get("config_type"), "Wave_Type": config.get("Wave_Type", "Sine")}
+    try:
+        cfg = dict(config)
+        for key in NUMERIC_KEYS:
+            if key in cfg:
+                cfg[key] = float(cfg[key])
+        if cfg.get("config_type") not in CONFIG_TYPES:
+            raise ValueError(f"Unknown configuration: {cfg.get('config_type')}")
+        kwargs = {k: cfg[k] for k in ("C", "V_in2", "R_in2", "A_ol") if k in cfg}
+
+        # Rf = 0 designs give 0/0 feedback currents; those come out as NaN without warnings
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Operating point at the DC offset (the schematic's default live Vin)
+            dc = OpAmpSolver(cfg["config_type"], cfg["R_in"], cfg["R_f"], cfg.get("V_in_dc", 0.0), cfg["V_cc"], **kwargs)
+            dc.calculate_parameters()
+
+            wave = OpAmpSolver(cfg["config_type"], cfg["R_in"], cfg["R_f"], cfg.get("V_in_amp", 1.0), cfg["V_cc"], **kwargs)
+            t, vin, vout = wave.generate_waveforms(freq=cfg.get("freq", 1.0), duration=cfg.get("duration", 2.0),
+                                                   points=int(cfg["points"]) if "points" in cfg else None,
+                                                   wave_type=summary["Wave_Type"])
+
+        summary.update({
+            "ideal_gain": float(dc.ideal_gain),
+            "actual_gain": float(dc.actual_gain),
+            "beta": float(dc.beta),
+            "noise_gain": float(dc.noise_gain),
+            "V_out_dc": float(dc.V_out),
+            "vout_min": float(vout.min()),
+            "vout_max": float(vout.max()),
+            "vout_pp": float(vout.max() - vout.min()),
+            "clip_fraction": float(np.mean(np.abs(vout) >= cfg["V_cc"])),
+        })
+        if waveforms_dir:
+            np.savez(os.path.join(waveforms_dir, f"row_{index:06d}.npz"), t=t, vin=vin, vout=vout)
+    except Exception as e: # Report bad rows instead of aborting the batch
+        summary["error"] = f"{type(e).__name__}: {e}"
+    return summary
+
+class _SummaryWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.is_csv = path.lower().endswith(".csv")
+        if self.is_csv:
+            self.writer = csv.DictWriter(self.file, fieldnames=SUMMARY_FIELDS, extrasaction="ignore")
+            self.writer.writeheader()
+
+    def write(self, rows):
+        for row in rows:
+            if self.is_csv:
+                self.writer.writerow(row)
+            else:
+                # JSON has no Infinity/NaN: write them as null
+                row = {k: None if isinstance(v, float) and not math.isfinite(v) else v for k, v in row.items()}
+                self.file.write(json.dumps(row, allow_nan=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def run_batch(input_path, output_path, workers=None, waveforms_dir=None, batch_size=256):
+    """
+    Solves every configuration in input_path and writes summaries to output_path (.csv or .jsonl),
+    batch by batch in input order. Returns (rows solved, rows with errors).
+    """
+    if waveforms_dir:
+        os.makedirs(waveforms_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    tasks = ((i, config, waveforms_dir) for i, config in enumerate(read_configs(input_path)))
+
+    writer = _SummaryWriter(output_path)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    chunksize = max(1, batch_size // (4 * workers))
+    total = errors = 0
+    try:
+        # Bounded batches keep memory flat and let results hit the disk as they finish
+        while True:
+            batch = list(islice(tasks, batch_size))
+            if not batch:
+                break
+            rows = list(pool.map(solve_config, batch, chunksize=chunksize) if pool else map(solve_config, batch))
+            writer.write(rows)
+            total += len(rows)
+            errors += sum(1 for r in rows if "error" in r)
+    finally:
+        if pool:
+            pool.shutdown()
+        writer.close()
+    return total, errors
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve exported op-amp configurations in batch.")
+    parser.add_argument("input", help="JSON-lines, CSV or JSON file of configurations")
+    parser.add_argument("-o", "--output", required=True, help="summary file (.csv or .jsonl)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--waveforms-dir", default=None, help="also save each row's (t, vin, vout) as .npz here")
+    parser.add_argument("--batch-size", type=int, default=256, help="rows per dispatch/write batch")
+    args = parser.parse_args(argv)
+
+    total, errors = run_batch(args.input, args.output, workers=args.workers,
+                              waveforms_dir=args.waveforms_dir, batch_size=args.batch_size)
+    print(f"Solved {total} configurations ({errors} with errors) -> {args.output}")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Benchmarks for the solver, waveform and schematic hot paths.
+
+    python benchmarks.py -o bench.json                  # full run
+    python benchmarks.py --quick --filter waveforms     # subset, points up to 1e5
+    python benchmarks.py -o new.json --baseline bench.json --threshold 0.15
+    python benchmarks.py --startup --filter none        # per-page cold start against the budget
+
+Each case records throughput, latency percentiles and peak traced memory. With --baseline, cases
+whose median latency grew by more than the threshold are reported and the exit status is 1.
+--startup also starts a fresh interpreter per page and reports cold-start and first-render times;
+a page over its STARTUP_BUDGET_S also makes the exit status 1.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from opamp_physics import CONFIG_TYPES, OpAmpSolver, solve_batch
+from pipeline import Pipeline, make_stage
+from visualizer import render_dynamic_schematic, render_schematic_batch
+
+WAVE_TYPES = ["Sine", "Square", "Triangle"]
+
+POINTS = [1000, 10000, 100000, 1000000, 10000000]
+
+def _solver(config_type, V_in=1.0):
+    return OpAmpSolver(config_type, 1000.0, 10000.0, V_in, 15.0, V_in2=0.5)
+
+def build_cases(quick=False):
+    # name -> (function to time, work items per call for throughput)
+    cases = {}
+    for config in CONFIG_TYPES:
+        solver = _solver(config)
+        cases[f"calculate_parameters/{config}"] = (solver.calculate_parameters, 1)
+
+    for points in POINTS[:3] if quick else POINTS:
+        for config in CONFIG_TYPES:
+            for wave in WAVE_TYPES:
+                solver = _solver(config)
+                cases[f"generate_waveforms/{config}/{wave}/{points}"] = (
+                    lambda s=solver, w=wave, p=points: s.generate_waveforms(points=p, wave_type=w), points)
+
+    # Automatic resolution on a long multi-period display (periodic tiling fast path)
+    solver = _solver("Inverting")
+    auto = solver.auto_points(5000.0, 2.0, "Sine")
+    cases["generate_waveforms/Inverting/Sine/auto/10000 periods"] = (
+        lambda s=solver: s.generate_waveforms(freq=5000.0, duration=2.0, wave_type="Sine"), auto)
+
+    for config in ["Inverting", "Non-Inverting", "Voltage Follower"]:
+        solver = _solver(config)
+        solver.calculate_parameters()
+        state = solver.get_state()
+        cases[f"render_dynamic_schematic/{config}"] = (lambda st=state: render_dynamic_schematic(st), 1)
+    frame_vin = np.linspace(-1, 1, 1000)
+    frame_vout = solve_batch("Inverting", 1000.0, 10000.0, frame_vin, 15.0)["V_out"]
+    cases["render_schematic_batch/Inverting/1000"] = (
+        lambda: render_schematic_batch("Inverting", frame_vin, frame_vout), 1000)
+
+    n = 100000 if quick else 1000000
+    v_in = np.linspace(-1, 1, n)
+    cases[f"solve_batch/Inverting/{n}"] = (lambda v=v_in: solve_batch("Inverting", 1000.0, 10000.0, v, 15.0), n)
+    cases["simulate_transient/Inverting/48000"] = (
+        lambda s=_solver("Inverting"): s.simulate_transient(freq=1000.0, duration=1.0, points=48000), 48000)
+
+    n = 1000000 if quick else 10000000
+    chain_in = np.random.default_rng(0).standard_normal(n) * 0.01
+    chain_out = np.empty(n)
+    chain = Pipeline([make_stage("Non-Inverting", 1e4, 1e3, 15.0, 1e-6) for _ in range(9)]
+                     + [make_stage("Integrator", 1e3, 0.0, 15.0, 1e-6)])
+    cases[f"pipeline/10 stages/{n}"] = (lambda: chain.run(chain_in, chain_out), n)
+    return cases
+
+def measure(func, items, min_time=0.2, min_repeats=5, max_repeats=1000):
+    func() # Warm-up (caches, lazy imports)
+    timings = []
+    start = time.perf_counter()
+    while len(timings) < max_repeats and (len(timings) < min_repeats or time.perf_counter() - start < min_time):
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+    timings = np.array(timings)
+
+    # Peak memory in a separate call: tracemalloc slows the code down too much to time under it
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p90, p99 = np.percentile(timings, [50, 90, 99])
+    return {
+        "repeats": len(timings),
+        "p50_s": float(p50),
+        "p90_s": float(p90),
+        "p99_s": float(p99),
+        "mean_s": float(timings.mean()),
+        "throughput_per_s": float(items / p50) if p50 > 0 else float("inf"),
+        "items_per_call": items,
+        "peak_bytes": int(peak),
+    }
+
+# Page label in the sidebar selector, and the cold-start budget in seconds (fresh interpreter ->
+# page rendered). The Lab budget covers numpy, matplotlib and the first Lab render.
+PAGES = {"Home": "🏠 Home", "Tutorial": "📚 Tutorial", "Lab": "🔬 Lab Explorer"}
+STARTUP_BUDGET_S = {"Home": 3.0, "Tutorial": 3.0, "Lab": 8.0}
+
+_STARTUP_SCRIPT = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+at.run()
+if sys.argv[1] != "🏠 Home":
+    at.sidebar.selectbox[0].set_value(sys.argv[1]).run()
+import profiling
+print(json.dumps(profiling.first_renders()))
+"""
+
+def measure_startup(page, repeats=3):
+    """
+    Cold start of one page: a new interpreter runs app.py headless up to that page (non-Home pages
+    render Home first, as a visitor would). Returns wall-clock cold-start and the app's own
+    first-render time for the page, as medians over `repeats` fresh processes.
+    """
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    cold, render = [], []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT, PAGES[page]], cwd=app_dir,
+                             capture_output=True, text=True, check=True).stdout
+        cold.append(time.perf_counter() - t0)
+        renders = {r["page"]: r for r in json.loads(out.strip().splitlines()[-1])}
+        render.append(renders[page]["first_render_ms"] / 1e3)
+    return {
+        "repeats": repeats,
+        "cold_start_s": float(np.median(cold)),
+        "first_render_s": float(np.median(render)),
+        "budget_s": STARTUP_BUDGET_S[page],
+    }
+
+def run(quick=False, name_filter=None, min_time=0.2, log=print):
+    results = {}
+    for name, (func, items) in build_cases(quick).items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(func, items, min_time=min_time)
+        r = results[name]
+        log(f"{name:60s} p50 {r['p50_s']*1e3:10.3f} ms  p99 {r['p99_s']*1e3:10.3f} ms  peak {r['peak_bytes']/1e6:9.2f} MB")
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+def compare(current, baseline, threshold=0.10):
+    """
+    Cases present in both runs whose median latency grew by more than `threshold` (relative).
+    Returns a list of (name, baseline p50, current p50, relative change), worst first.
+    """
+    regressions = []
+    for name, res in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or base["p50_s"] <= 0:
+            continue
+        change = res["p50_s"] / base["p50_s"] - 1
+        if change > threshold:
+            regressions.append((name, base["p50_s"], res["p50_s"], change))
+    return sorted(regressions, key=lambda r: -r[3])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark op-amp solver, waveform and schematic paths.")
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    parser.add_argument("--quick", action="store_true", help="points up to 1e5 only")
+    parser.add_argument("--filter", default=None, help="only cases whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds to spend timing each case")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative p50 slowdown that counts as a regression")
+    parser.add_argument("--startup", action="store_true", help="also measure per-page cold start against the budget")
+    args = parser.parse_args(argv)
+
+    current = run(quick=args.quick, name_filter=args.filter, min_time=args.min_time)
+    over_budget = []
+    if args.startup:
+        current["startup"] = {}
+        for page in PAGES:
+            r = current["startup"][page] = measure_startup(page)
+            print(f"startup/{page:12s} cold start {r['cold_start_s']:6.2f} s  first render {r['first_render_s']:6.2f} s  budget {r['budget_s']:.1f} s")
+            if r["cold_start_s"] > r["budget_s"]:
+                over_budget.append(page)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: {before*1e3:.3f} ms -> {after*1e3:.3f} ms (+{change*100:.1f}%)")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold*100:.0f}% against {args.baseline}")
+    if over_budget:
+        print(f"OVER STARTUP BUDGET: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
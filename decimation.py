@@ -0,0 +1,68 @@
+import numpy as np
+
+def _bucket_extremes(y, start, size, count):
+    # Indices of the min and max of `count` consecutive buckets of `size` samples from `start`
+    block = y[start:start + size * count].reshape(count, size)
+    offsets = start + np.arange(count) * size
+    return offsets + np.argmin(block, axis=1), offsets + np.argmax(block, axis=1)
+
+def minmax_decimate(x, y, n_out):
+    """
+    Keeps the minimum and maximum sample of each of (n_out - 2) // 2 near-equal buckets, in
+    order, plus both end points, so at most n_out samples. Peaks and clipping edges survive
+    exactly; cost is one pass over y. Returns (x, y) unchanged when there are already n_out
+    samples or fewer, and just the end points when n_out is below 4.
+    """
+    n = len(y)
+    if n <= n_out:
+        return x, y
+    buckets = (n_out - 2) // 2
+    if buckets < 1:
+        return x[[0, n - 1]], y[[0, n - 1]]
+    size = -(-n // buckets) # Rounded up, so the buckets (and a shorter last one) cover every sample
+    full = n // size
+    parts = [[0, n - 1], *_bucket_extremes(y, 0, size, full)]
+    tail = n - size * full
+    if tail: # The last few samples that do not fill a bucket form one of their own
+        parts.extend(_bucket_extremes(y, size * full, tail, 1))
+    keep = np.unique(np.concatenate(parts)) # Sorted, and a flat bucket's min == max collapses to one
+    return x[keep], y[keep]
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: picks one sample per bucket, the one forming the largest
+    triangle with the previously kept sample and the next bucket's average. Keeps the visual
+    shape with exactly n_out points but, unlike min/max, may shave single-sample spikes.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+    # n_out - 2 buckets between the fixed first and last samples
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    avg_x = np.append(avg_x[1:], x[n - 1])
+    avg_y = np.append(avg_y[1:], y[n - 1])
+
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return x[keep], y[keep]
+
+DECIMATORS = {"minmax": minmax_decimate, "lttb": lttb}
+
+def decimate(x, y, n_out, method="minmax"):
+    """
+    Reduces (x, y) to about n_out points for display, so plotting cost no longer grows with the
+    simulation resolution. method: "minmax" (exact extremes) or "lttb" (shape-preserving).
+    """
+    if method not in DECIMATORS:
+        raise ValueError(f"Unknown decimation method: {method}")
+    x, y = np.asarray(x), np.asarray(y)
+    return DECIMATORS[method](x, y, int(n_out))
@@ -0,0 +1,256 @@
+import asyncio
+import contextlib
+import json
+import struct
+import threading
+import urllib.parse
+
+import numpy as np
+
+from opamp_physics import Config, OpAmpSolver, _memoryless_output, _unit_wave
+from pipeline import stage_from_solver
+
+try:
+    from websockets.asyncio.server import serve
+    from websockets.exceptions import ConnectionClosed
+except ImportError: # Optional: installed with Streamlit's server stack; without it there is no live scope
+    serve = ConnectionClosed = None
+
+FRAME_RATE = 60 # Blocks per second of simulated time
+QUEUE_FRAMES = 4 # Frames buffered per client before the oldest is dropped
+
+# Frame: sequence, samples, sample rate, V_cc, display window (s), then float32 vin[n], vout[n]
+FRAME_HEADER = struct.Struct("<IIfff")
+
+DEFAULT_SETTINGS = {"config_type": "Inverting", "R_in": 1000.0, "R_f": 10000.0, "V_in": 1.0, "V_cc": 15.0,
+                    "C": 1e-6, "V_in2": 0.0, "R_in2": 10000.0, "freq": 1.0, "wave_type": "Sine", "sample_rate": 48000.0}
+
+# Settings the page's own controls may change, with their allowed ranges
+CLIENT_SETTINGS = {"freq": (0.1, 1000.0), "V_in": (0.0, 10.0)}
+
+class ScopeServer:
+    """
+    Streams live op-amp output to browser scopes over a local WebSocket. A background thread runs
+    an asyncio loop; for each connected page a producer simulates one block of 1/FRAME_RATE s at
+    the channel's sample rate and queues it as a compact binary frame. A separate sender awaits
+    each write, so a slow client backs up its bounded queue and the oldest frames are dropped
+    rather than the producer falling behind. New settings apply from the next block.
+    """
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.channels = {} # channel id -> settings dict, replaced (never mutated) on change
+        self.dropped = {} # channel id -> frames dropped so far
+        self._published = {}
+        self._lock = threading.Lock()
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(port, started), name="live-scope", daemon=True)
+        self.port = None
+        self.thread.start()
+        started.wait(10)
+        if self.port is None:
+            raise RuntimeError("The live scope server failed to start")
+
+    def _run(self, port, started):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._start(port))
+        finally:
+            started.set()
+        self.loop.run_forever()
+
+    async def _start(self, port):
+        self.server = await serve(self._handle, self.host, port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    def publish(self, channel, **settings):
+        """
+        Sets a channel's circuit from the Streamlit script. Only values that changed since the last
+        publish are applied, so adjustments made on the page itself survive unrelated reruns.
+        """
+        with self._lock:
+            last = self._published.get(channel, {})
+            changed = {k: v for k, v in settings.items() if last.get(k) != v}
+            self._published[channel] = settings
+            if changed or channel not in self.channels:
+                self.channels[channel] = {**DEFAULT_SETTINGS, **self.channels.get(channel, {}), **changed}
+
+    def _update(self, channel, message):
+        # Settings sent by the page: only CLIENT_SETTINGS, clamped to their ranges
+        try:
+            values = json.loads(message)
+        except ValueError:
+            return
+        changed = {}
+        for key, (lo, hi) in CLIENT_SETTINGS.items():
+            if isinstance(values.get(key), (int, float)):
+                changed[key] = min(max(float(values[key]), lo), hi)
+        if changed:
+            with self._lock:
+                self.channels[channel] = {**self.channels[channel], **changed}
+
+    async def _handle(self, connection):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(connection.request.path).query)
+        channel = query.get("id", [""])[0]
+        if channel not in self.channels:
+            await connection.close(1008, "Unknown scope channel")
+            return
+        settings = self.channels[channel]
+        await connection.send(json.dumps({k: settings[k] for k in CLIENT_SETTINGS}))
+
+        queue = asyncio.Queue(QUEUE_FRAMES)
+        sender = asyncio.create_task(self._send(connection, queue))
+        reader = asyncio.create_task(self._read(connection, channel))
+        try:
+            await self._produce(channel, queue, sender)
+        finally:
+            # Await both tasks so a closed connection's error is consumed here, not logged as
+            # "Task exception was never retrieved"
+            for task in (sender, reader):
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, ConnectionClosed):
+                    await task
+
+    async def _send(self, connection, queue):
+        while True:
+            frame = await queue.get()
+            await connection.send(frame) # Waits while the socket's write buffer is full
+
+    async def _read(self, connection, channel):
+        async for message in connection:
+            if isinstance(message, str):
+                self._update(channel, message)
+
+    async def _produce(self, channel, queue, sender):
+        settings = None
+        sample = seq = 0
+        deadline = self.loop.time()
+        while not sender.done():
+            if self.channels[channel] is not settings:
+                settings = self.channels[channel]
+                s = settings
+                solver = OpAmpSolver(s["config_type"], s["R_in"], s["R_f"], s["V_in"], s["V_cc"],
+                                     C=s["C"], V_in2=s["V_in2"], R_in2=s["R_in2"])
+                rate = float(s["sample_rate"])
+                n = max(1, int(rate / FRAME_RATE))
+                # Integrator/differentiator state carries across blocks; the others are memoryless
+                stage = stage_from_solver(solver, 1 / rate) if s["config_type"] in (Config.INTEGRATOR, Config.DIFFERENTIATOR) else None
+                window = min(max(2 / s["freq"], 0.01), 2.0)
+                vout = np.empty(n)
+
+            unit = _unit_wave((sample + np.arange(n)) / rate, s["freq"], s["wave_type"])
+            vin = solver.V_in * unit
+            if stage is not None:
+                stage.process(vin, vout)
+            else:
+                ideal = _memoryless_output(solver.config_type, solver.R_in, solver.R_f, solver.R_in2, vin, solver.V_in2 * unit)
+                np.clip(ideal, -solver.V_cc, solver.V_cc, out=vout)
+            frame = (FRAME_HEADER.pack(seq, n, rate, solver.V_cc, window)
+                     + vin.astype("<f4").tobytes() + vout.astype("<f4").tobytes())
+            if queue.full(): # Client is behind: drop the oldest frame, never block the producer
+                queue.get_nowait()
+                self.dropped[channel] = self.dropped.get(channel, 0) + 1
+            queue.put_nowait(frame)
+            sample += n
+            seq += 1
+
+            # Pace blocks to simulated time; after a stall, resynchronize instead of bursting
+            deadline += n / rate
+            delay = deadline - self.loop.time()
+            if delay < -0.5:
+                deadline = self.loop.time()
+            await asyncio.sleep(max(delay, 0))
+
+_server = None
+_server_lock = threading.Lock()
+
+def get_server():
+    # One scope server per process, started on first use
+    global _server
+    if serve is None:
+        raise RuntimeError("The live scope needs the websockets package")
+    with _server_lock:
+        if _server is None:
+            _server = ScopeServer()
+    return _server
+
+_SCOPE_HTML = """
+<div style="font-family: Arial, sans-serif; font-size: 13px;">
+<canvas id="scope" style="width: 100%%; height: %(height)dpx; border: 1px solid #ddd;"></canvas>
+<div style="margin-top: 4px;">
+  Frequency <input id="freq" type="range" min="-1" max="3" step="0.01"> <span id="freq_v"></span>
+  &nbsp; Amplitude <input id="amp" type="range" min="0" max="10" step="0.1"> <span id="amp_v"></span>
+  <span id="stats" style="float: right; color: #666;"></span>
+</div>
+</div>
+<script>
+const HEADER = %(header)d;
+const canvas = document.getElementById("scope"), ctx = canvas.getContext("2d");
+const freq = document.getElementById("freq"), amp = document.getElementById("amp");
+const ws = new WebSocket("ws://%(host)s:%(port)d/scope?id=%(channel)s");
+ws.binaryType = "arraybuffer";
+let vin = new Float32Array(0), vout = new Float32Array(0), head = 0, vcc = 1;
+let lastSeq = -1, dropped = 0, frames = 0, fps = 0, drawn = 0, fpsStart = performance.now(), status = "connecting";
+
+function label() {
+  document.getElementById("freq_v").textContent = (10 ** freq.value).toPrecision(3) + " Hz";
+  document.getElementById("amp_v").textContent = Number(amp.value).toFixed(1) + " V";
+}
+freq.oninput = () => { label(); ws.send(JSON.stringify({freq: 10 ** freq.value})); };
+amp.oninput = () => { label(); ws.send(JSON.stringify({V_in: Number(amp.value)})); };
+ws.onclose = () => { status = "disconnected"; };
+ws.onmessage = (e) => {
+  if (typeof e.data === "string") { // Current settings, sent on connect
+    const s = JSON.parse(e.data);
+    freq.value = Math.log10(s.freq); amp.value = s.V_in; label(); status = "live";
+    return;
+  }
+  const h = new DataView(e.data);
+  const seq = h.getUint32(0, true), n = h.getUint32(4, true), rate = h.getFloat32(8, true);
+  vcc = h.getFloat32(12, true);
+  const size = Math.max(n, Math.round(rate * h.getFloat32(16, true)));
+  if (size !== vin.length) { vin = new Float32Array(size); vout = new Float32Array(size); head = 0; }
+  if (lastSeq >= 0 && seq > lastSeq + 1) dropped += seq - lastSeq - 1;
+  lastSeq = seq; frames++;
+  const a = new Float32Array(e.data, HEADER, n), b = new Float32Array(e.data, HEADER + 4 * n, n);
+  for (let i = 0; i < n; i++) { vin[head] = a[i]; vout[head] = b[i]; head = (head + 1) %% size; }
+};
+
+function trace(data, color, w, h, scale) {
+  // Min/max per pixel column of the ring buffer, oldest sample on the left
+  const size = data.length;
+  ctx.strokeStyle = color; ctx.lineWidth = 2; ctx.beginPath();
+  for (let x = 0; x < w; x++) {
+    const lo_i = Math.floor(x * size / w), hi_i = Math.max(lo_i + 1, Math.floor((x + 1) * size / w));
+    let lo = Infinity, hi = -Infinity;
+    for (let i = lo_i; i < hi_i; i++) { const v = data[(head + i) %% size]; if (v < lo) lo = v; if (v > hi) hi = v; }
+    if (x === 0) ctx.moveTo(x, h / 2 - lo * scale); else ctx.lineTo(x, h / 2 - lo * scale);
+    ctx.lineTo(x, h / 2 - hi * scale);
+  }
+  ctx.stroke();
+}
+
+function draw(now) {
+  const w = canvas.width = canvas.clientWidth, h = canvas.height = canvas.clientHeight;
+  const scale = h / 2 / (1.1 * vcc);
+  ctx.clearRect(0, 0, w, h);
+  ctx.strokeStyle = "#ccc"; ctx.lineWidth = 1; ctx.setLineDash([4, 4]);
+  for (const v of [vcc, 0, -vcc]) { ctx.beginPath(); ctx.moveTo(0, h / 2 - v * scale); ctx.lineTo(w, h / 2 - v * scale); ctx.stroke(); }
+  ctx.setLineDash([]);
+  if (vin.length) { trace(vin, "rgba(0, 0, 255, 0.7)", w, h, scale); trace(vout, "rgba(255, 0, 0, 0.7)", w, h, scale); }
+  drawn++;
+  if (now - fpsStart > 1000) { fps = drawn * 1000 / (now - fpsStart); drawn = 0; fpsStart = now; }
+  document.getElementById("stats").textContent = status + " | " + fps.toFixed(0) + " fps | dropped " + dropped;
+  requestAnimationFrame(draw);
+}
+requestAnimationFrame(draw);
+</script>
+"""
+
+def scope_html(server, channel, height=300):
+    """
+    Self-contained page with the canvas scope for `channel`. It only depends on the server and
+    channel, so Streamlit keeps the same iframe (and connection) across reruns.
+    """
+    return _SCOPE_HTML % {"host": server.host, "port": server.port, "channel": channel,
+                          "height": height, "header": FRAME_HEADER.size}
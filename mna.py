@@ -0,0 +1,242 @@
+import functools
+
+import numpy as np
+
+try:
+    from scipy.sparse import csc_matrix
+    from scipy.sparse.linalg import splu
+except ImportError: # Optional: sparse LU; without it the dense inverse is cached instead
+    splu = None
+
+GROUND = ("0", "gnd")
+
+class Circuit:
+    """
+    Modified nodal analysis of a small netlist. Elements are tuples:
+
+        ("R", name, node_a, node_b, ohms)            0 ohms is a wire
+        ("C", name, node_a, node_b, farads)          open at DC, backward Euler in transient
+        ("V", name, node_a, node_b, volts)           independent source, V(a) - V(b) = volts
+        ("OPAMP", name, plus, minus, out, A_ol)      Vout = A_ol * (V+ - V-); A_ol=None is ideal
+
+    Node "0" (or "gnd") is ground. The system matrix depends only on the components, the time
+    step and which op-amps sit on a rail, so it is factored once per such state and cached; new
+    source values cost one back-substitution, and a whole sweep is one multi-column solve.
+    Currents flow from the element's first node to its second (into the source or op-amp
+    output for those, as in SPICE).
+    """
+    def __init__(self, netlist):
+        self.elements = [tuple(e) for e in netlist]
+        self.nodes = []
+        for e in self.elements:
+            if e[0] not in ("R", "C", "V", "OPAMP"):
+                raise ValueError(f"Unknown element type: {e[0]}")
+            for node in e[2:5] if e[0] == "OPAMP" else e[2:4]:
+                if node not in GROUND and node not in self.nodes:
+                    self.nodes.append(node)
+        self.node_index = {n: i for i, n in enumerate(self.nodes)}
+
+        # Elements with a branch-current unknown: sources, wires and op-amp outputs
+        branches = [e[1] for e in self.elements if e[0] in ("V", "OPAMP") or (e[0] == "R" and e[4] == 0)]
+        self.branch_index = {name: len(self.nodes) + k for k, name in enumerate(branches)}
+        self.size = len(self.nodes) + len(branches)
+        self.sources = {e[1]: e[4] for e in self.elements if e[0] == "V"}
+        self.opamps = [e for e in self.elements if e[0] == "OPAMP"]
+        self._factors = {}
+
+    def _node(self, name):
+        return self.node_index.get(name) # None for ground
+
+    def _factor(self, dt=None, pinned=frozenset()):
+        # Cached solve function for (time step, op-amps pinned to a rail)
+        key = (dt, pinned)
+        if key in self._factors:
+            return self._factors[key]
+
+        rows, cols, vals = [], [], []
+        def add(r, c, v):
+            if r is not None and c is not None:
+                rows.append(r); cols.append(c); vals.append(v)
+
+        for e in self.elements:
+            kind, name = e[0], e[1]
+            if kind == "R" and e[4] != 0 or kind == "C" and dt:
+                g = 1 / e[4] if kind == "R" else e[4] / dt
+                a, b = self._node(e[2]), self._node(e[3])
+                add(a, a, g); add(b, b, g); add(a, b, -g); add(b, a, -g)
+            elif kind in ("V", "R"): # Sources and wires: V(a) - V(b) fixed
+                k, a, b = self.branch_index[name], self._node(e[2]), self._node(e[3])
+                add(a, k, 1); add(b, k, -1); add(k, a, 1); add(k, b, -1)
+            elif kind == "OPAMP":
+                k, p, m, o = self.branch_index[name], self._node(e[2]), self._node(e[3]), self._node(e[4])
+                add(o, k, 1)
+                if name in pinned: # Saturated: output is a fixed voltage
+                    add(k, o, 1)
+                elif e[5] is None or np.isinf(e[5]): # Ideal: virtual short
+                    add(k, p, 1); add(k, m, -1)
+                else:
+                    add(k, o, 1); add(k, p, -e[5]); add(k, m, e[5])
+
+        try:
+            if splu is not None:
+                lu = splu(csc_matrix((vals, (rows, cols)), shape=(self.size, self.size)))
+                solve = lu.solve
+            else:
+                dense = np.zeros((self.size, self.size))
+                np.add.at(dense, (rows, cols), vals)
+                inverse = np.linalg.inv(dense)
+                solve = lambda rhs: inverse @ rhs
+        except (RuntimeError, np.linalg.LinAlgError):
+            raise ValueError("Singular circuit: a node has no DC path or sources form a loop") from None
+        self._factors[key] = solve
+        return solve
+
+    def _rhs(self, sources, n, cap_voltages=None, dt=None):
+        rhs = np.zeros((self.size, n))
+        for name, value in sources.items():
+            rhs[self.branch_index[name]] = value
+        if cap_voltages is not None:
+            # Backward Euler companion: conductance C/dt plus a current source keeping v_prev
+            for e in self.elements:
+                if e[0] == "C":
+                    i_eq = e[4] / dt * cap_voltages[e[1]]
+                    a, b = self._node(e[2]), self._node(e[3])
+                    if a is not None:
+                        rhs[a] += i_eq
+                    if b is not None:
+                        rhs[b] -= i_eq
+        return rhs
+
+    def _solve_columns(self, rhs, V_cc, dt=None):
+        # Solve all columns, then re-solve those whose op-amp outputs went past the rails
+        x = self._factor(dt)(rhs)
+        if V_cc is None or not self.opamps:
+            return x
+        outputs = [self._node(e[4]) for e in self.opamps]
+        pinned = np.zeros((len(self.opamps), rhs.shape[1]), dtype=bool)
+        for _ in self.opamps:
+            v_out = x[outputs]
+            over = (np.abs(v_out) > V_cc) & ~pinned
+            if not over.any():
+                break
+            pinned |= over
+            for j, e in enumerate(self.opamps):
+                rhs[self.branch_index[e[1]], over[j]] = np.sign(v_out[j, over[j]]) * V_cc
+            patterns, groups = np.unique(pinned, axis=1, return_inverse=True)
+            for g, pattern in enumerate(patterns.T):
+                if pattern.any():
+                    cols = np.flatnonzero(groups.ravel() == g)
+                    names = frozenset(e[1] for e, p in zip(self.opamps, pattern) if p)
+                    x[:, cols] = self._factor(dt, names)(rhs[:, cols])
+        return x
+
+    def _results(self, x, shape, cap_prev=None, dt=None):
+        volts = {n: x[i].reshape(shape) for i, n in enumerate(self.nodes)}
+        def v(node):
+            return volts[node] if node not in GROUND else np.zeros(shape)
+        currents = {}
+        for e in self.elements:
+            if e[1] in self.branch_index:
+                currents[e[1]] = x[self.branch_index[e[1]]].reshape(shape)
+            elif e[0] == "R":
+                currents[e[1]] = (v(e[2]) - v(e[3])) / e[4]
+            elif cap_prev is None: # Capacitor at DC
+                currents[e[1]] = np.zeros(shape)
+            else:
+                currents[e[1]] = e[4] / dt * (v(e[2]) - v(e[3]) - cap_prev[e[1]])
+        return {"V": volts, "I": currents}
+
+    def solve(self, sources=None, V_cc=None):
+        """
+        DC operating point. sources: {source name: value}; values may be arrays, which broadcast
+        to a sweep shape and are solved together. With V_cc, op-amp outputs saturate at +/-V_cc.
+        Returns {"V": {node: array}, "I": {element: array}} with the sweep shape.
+        """
+        values = {**self.sources, **(sources or {})}
+        shape = np.broadcast_shapes(*[np.shape(v) for v in values.values()])
+        n = int(np.prod(shape))
+        flat = {k: np.broadcast_to(np.asarray(v, dtype=float), shape).ravel() for k, v in values.items()}
+        x = self._solve_columns(self._rhs(flat, n), V_cc)
+        return self._results(x, shape)
+
+    def transient(self, dt, sources, V_cc=None):
+        """
+        Backward-Euler time stepping from rest (capacitors uncharged). sources: {name: array of
+        per-step values or scalar}; the number of steps is the longest array. The matrix is
+        factored once for dt (and once per saturation state), so each step is a back-substitution.
+        Returns {"V": {node: (steps,)}, "I": {element: (steps,)}}.
+        """
+        values = {**self.sources, **sources}
+        steps = max(np.size(v) for v in values.values())
+        values = {k: np.broadcast_to(np.asarray(v, dtype=float), (steps,)) for k, v in values.items()}
+        caps = [e for e in self.elements if e[0] == "C"]
+        x = np.zeros((self.size, steps))
+        cap_v = {e[1]: 0.0 for e in caps}
+        cap_prev = {e[1]: np.zeros(steps) for e in caps}
+        for k in range(steps):
+            rhs = self._rhs({name: v[k] for name, v in values.items()}, 1, cap_v, dt)
+            col = self._solve_columns(rhs, V_cc, dt)[:, 0]
+            x[:, k] = col
+            for e in caps:
+                cap_prev[e[1]][k] = cap_v[e[1]]
+                a, b = self._node(e[2]), self._node(e[3])
+                cap_v[e[1]] = (col[a] if a is not None else 0.0) - (col[b] if b is not None else 0.0)
+        return self._results(x, (steps,), cap_prev, dt)
+
+def preset(config_type, R_in, R_f, C=1e-6, R_in2=10000, A_ol=100000, R_2=None, R_g=None):
+    """
+    Netlist of one of the Lab configurations. Inputs are sources "V1" (and "V2"); the op-amp's
+    inverting node is "n" and its output "out". The Difference Amplifier takes its (+) divider
+    R_2 / R_g separately, defaulting to the matched pair R_in / R_f.
+    """
+    opamp = ("OPAMP", "U1", "0", "n", "out", A_ol)
+    if config_type == "Inverting":
+        return [("V", "V1", "in", "0", 0.0), ("R", "Rin", "in", "n", R_in), ("R", "Rf", "n", "out", R_f), opamp]
+    elif config_type == "Non-Inverting":
+        return [("V", "V1", "in", "0", 0.0), ("R", "Rin", "n", "0", R_in), ("R", "Rf", "n", "out", R_f),
+                ("OPAMP", "U1", "in", "n", "out", A_ol)]
+    elif config_type == "Voltage Follower":
+        return [("V", "V1", "in", "0", 0.0), ("OPAMP", "U1", "in", "out", "out", A_ol)]
+    elif config_type == "Integrator":
+        return [("V", "V1", "in", "0", 0.0), ("R", "Rin", "in", "n", R_in), ("C", "C1", "n", "out", C), opamp]
+    elif config_type == "Differentiator":
+        return [("V", "V1", "in", "0", 0.0), ("C", "C1", "in", "n", C), ("R", "Rf", "n", "out", R_f), opamp]
+    elif config_type == "Summing Amplifier":
+        return [("V", "V1", "in", "0", 0.0), ("V", "V2", "in2", "0", 0.0), ("R", "Rin", "in", "n", R_in),
+                ("R", "Rin2", "in2", "n", R_in2), ("R", "Rf", "n", "out", R_f), opamp]
+    elif config_type == "Difference Amplifier":
+        R_2 = R_in if R_2 is None else R_2
+        R_g = R_f if R_g is None else R_g
+        return [("V", "V1", "in", "0", 0.0), ("V", "V2", "in2", "0", 0.0), ("R", "Rin", "in", "n", R_in),
+                ("R", "Rf", "n", "out", R_f), ("R", "R2", "in2", "p", R_2), ("R", "Rg", "p", "0", R_g),
+                ("OPAMP", "U1", "p", "n", "out", A_ol)]
+    raise ValueError(f"Unknown configuration: {config_type}")
+
+@functools.lru_cache(maxsize=64)
+def preset_circuit(config_type, R_in, R_f, C=1e-6, R_in2=10000, A_ol=100000, R_2=None, R_g=None):
+    # One Circuit (and so one set of factorizations) per component set
+    return Circuit(preset(config_type, R_in, R_f, C, R_in2, A_ol, R_2, R_g))
+
+def solve_preset(config_type, R_in, R_f, V_in, V_cc, A_ol=100000, C=1e-6, V_in2=0, R_in2=10000, R_2=None, R_g=None):
+    """
+    DC operating point of a Lab configuration through the MNA engine, keyed like solve_batch
+    (V_out, V_plus, V_minus, I_in, I_f). V_in and V_in2 may be arrays: a sweep is a single
+    multi-column back-substitution on the cached factorization.
+    Unlike the closed-form model, loading and unmatched resistors are exact, and a saturated
+    integrator's (-) input follows the network instead of the virtual-ground approximation.
+    """
+    circuit = preset_circuit(config_type, float(R_in), float(R_f), float(C), float(R_in2), float(A_ol), R_2, R_g)
+    sources = {"V1": V_in}
+    if "V2" in circuit.sources:
+        sources["V2"] = V_in2
+    sol = circuit.solve(sources, V_cc=V_cc)
+    V, I = sol["V"], sol["I"]
+    zero = np.zeros_like(V["out"])
+    plus = {"Non-Inverting": "in", "Voltage Follower": "in", "Difference Amplifier": "p"}.get(config_type)
+    return {
+        "V_out": V["out"],
+        "V_plus": V[plus] if plus else zero,
+        "V_minus": V["out"] if config_type == "Voltage Follower" else V["n"],
+        "I_in": -I["V1"], # Drawn from the input source
+        "I_f": I["Rf"] if "Rf" in I else (I["C1"] if config_type == "Integrator" else zero),
+    }
@@ -0,0 +1,157 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from opamp_physics import solve_batch
+
+PARAMETERS = ["R_in", "R_f", "V_in", "V_cc", "A_ol", "C", "V_in2", "R_in2"]
+
+DEFAULT_NOMINAL = {"A_ol": 100000, "C": 1e-6, "V_in2": 0, "R_in2": 10000}
+
+def _draw(rng, nominal, spread, n):
+    # spread = (kind, width): "normal" width is the 3-sigma relative tolerance,
+    # "uniform" is +/- width relative, "lognormal" is sigma of log(value)
+    kind, width = spread
+    if kind == "normal":
+        return nominal * (1 + (width / 3) * rng.standard_normal(n))
+    elif kind == "uniform":
+        return nominal * (1 + width * rng.uniform(-1, 1, n))
+    elif kind == "lognormal":
+        return nominal * np.exp(width * rng.standard_normal(n))
+    raise ValueError(f"Unknown distribution: {kind}")
+
+def _run_chunk(args):
+    # Worker entry point: one chunk of samples -> raw outputs (kept small by chunk_size)
+    config_type, nominal, tolerances, n, seed_seq, outputs = args
+    rng = np.random.default_rng(seed_seq)
+    params = {}
+    for name in PARAMETERS:
+        if name in tolerances:
+            params[name] = _draw(rng, nominal[name], tolerances[name], n)
+        else:
+            params[name] = nominal[name]
+    result = solve_batch(config_type, **params)
+    return {k: np.broadcast_to(result[k], (n,)) for k in outputs}
+
+def _summarize(chunk, edges, spec):
+    # Reduce one chunk of raw outputs to histogram counts, running stats and the spec pass count
+    n = len(next(iter(chunk.values())))
+    ok = np.ones(n, dtype=bool)
+    summary = {"counts": {}, "underflow": {}, "overflow": {}, "stats": {}, "passed": 0}
+    for k, values in chunk.items():
+        summary["counts"][k], _ = np.histogram(values, bins=edges[k])
+        summary["underflow"][k] = int(np.sum(values < edges[k][0]))
+        summary["overflow"][k] = int(np.sum(values > edges[k][-1]))
+        summary["stats"][k] = _RunningStats()
+        summary["stats"][k].add(values)
+        if k in spec:
+            low, high = spec[k]
+            ok &= (values >= low) & (values <= high)
+    summary["passed"] = int(np.sum(ok))
+    return summary
+
+def _run_and_summarize(args):
+    task, edges, spec = args
+    return _summarize(_run_chunk(task), edges, spec)
+
+def _merge_all(total, partials):
+    for part in partials:
+        for k in total["counts"]:
+            total["counts"][k] += part["counts"][k]
+            total["underflow"][k] += part["underflow"][k]
+            total["overflow"][k] += part["overflow"][k]
+            total["stats"][k].merge(part["stats"][k])
+        total["passed"] += part["passed"]
+
+class _RunningStats:
+    # Mergeable count / mean / variance / extremes (Chan et al. parallel update)
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def add(self, x):
+        x = x[np.isfinite(x)]
+        if x.size == 0:
+            return
+        other = _RunningStats()
+        other.count, other.mean = x.size, float(np.mean(x))
+        other.m2 = float(np.sum((x - other.mean) ** 2))
+        other.min, other.max = float(np.min(x)), float(np.max(x))
+        self.merge(other)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        delta = other.mean - self.mean
+        total = self.count + other.count
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta**2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def summary(self):
+        std = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+        return {"count": self.count, "mean": self.mean, "std": float(std), "min": self.min, "max": self.max}
+
+def monte_carlo(config_type, nominal, tolerances, n_samples=1_000_000, chunk_size=100_000, seed=0,
+                workers=None, outputs=("actual_gain", "V_out"), spec=None, bins=200, ranges=None):
+    """
+    Tolerance analysis of one configuration.
+    nominal: values for OpAmpSolver's parameters (R_in, R_f, V_in, V_cc, ...).
+    tolerances: {parameter: (kind, width)} with kind "normal", "uniform" or "lognormal".
+    spec: optional {output: (low, high)}; the yield is the fraction of samples meeting all of them.
+
+    Chunks are solved with solve_batch on a process pool (workers=1 runs in-process) and folded
+    into fixed-bin histograms and running statistics as they arrive, so memory stays at a few
+    chunks regardless of n_samples. Each chunk has its own seed derived from `seed`, so results
+    do not depend on the number of workers.
+    """
+    if n_samples < 1:
+        raise ValueError("n_samples must be >= 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    nominal = {**DEFAULT_NOMINAL, **nominal}
+    missing = [p for p in PARAMETERS if p not in nominal]
+    if missing:
+        raise ValueError(f"Missing nominal values: {missing}")
+    spec = spec or {}
+    outputs = tuple(outputs) + tuple(k for k in spec if k not in outputs)
+
+    sizes = [min(chunk_size, n_samples - start) for start in range(0, n_samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(config_type, nominal, tolerances, n, s, outputs) for n, s in zip(sizes, seeds)]
+
+    # The first chunk doubles as a pilot that fixes histogram ranges not given explicitly
+    first = _run_chunk(tasks[0])
+    ranges = dict(ranges or {})
+    for k in outputs:
+        if k not in ranges:
+            finite = first[k][np.isfinite(first[k])]
+            low, high = (float(finite.min()), float(finite.max())) if finite.size else (0.0, 1.0)
+            pad = 0.1 * (high - low) or 0.1 * abs(low) or 1.0
+            ranges[k] = (low - pad, high + pad)
+    edges = {k: np.linspace(ranges[k][0], ranges[k][1], bins + 1) for k in outputs}
+
+    total = _summarize(first, edges, spec)
+    workers = workers or os.cpu_count() or 1
+    rest = [(task, edges, spec) for task in tasks[1:]]
+    if workers == 1 or not rest:
+        _merge_all(total, map(_run_and_summarize, rest))
+    else:
+        # Workers reduce their own chunk, so only histogram counts and stats cross processes
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            _merge_all(total, pool.map(_run_and_summarize, rest))
+
+    histograms = {k: {"edges": edges[k], "counts": total["counts"][k], "underflow": total["underflow"][k],
+                      "overflow": total["overflow"][k]} for k in outputs}
+    return {
+        "n_samples": n_samples,
+        "stats": {k: st.summary() for k, st in total["stats"].items()},
+        "histograms": histograms,
+        "yield": total["passed"] / n_samples if spec else None,
+    }
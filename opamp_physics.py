@@ -1,8 +1,356 @@
+import enum
+import functools
+import types
+
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError: # Optional: compiles the transient kernel when available
+    njit = None
+
+def _unit_wave(t, freq, wave_type):
+    if wave_type == "Sine":
+        return np.sin(2 * np.pi * freq * t)
+    elif wave_type == "Square":
+        # +/-1 only: np.sign would give 0 where sin is exactly 0, a half step at each period start
+        return np.where(np.sin(2 * np.pi * freq * t) < 0, -1.0, 1.0)
+    elif wave_type == "Triangle":
+        return 2 * np.abs(2 * (t * freq - np.floor(t * freq + 0.5))) - 1
+    raise ValueError(f"Unknown wave type: {wave_type}")
+
+def _unit_slope(t, freq, wave_type, dt):
+    # d/dt of the unit waveform over the 1-D grid t: exact for Sine and Triangle. A Square's
+    # edges become one-sample impulses holding the whole step (its exact area), where
+    # np.gradient would smear each edge over two samples with heights that depend on where it
+    # falls between them
+    if wave_type == "Sine":
+        return 2 * np.pi * freq * np.cos(2 * np.pi * freq * t)
+    elif wave_type == "Square":
+        # Difference the grid's own samples: re-evaluating at t - dt rounds to the same side of
+        # an edge that falls on a sample, and the impulse would be lost
+        wave = _unit_wave(t, freq, wave_type)
+        prev = np.concatenate((_unit_wave(t[:1] - dt, freq, wave_type), wave[:-1]))
+        return (wave - prev) / dt
+    elif wave_type == "Triangle":
+        return 4 * freq * np.sign(t * freq - np.floor(t * freq + 0.5))
+    raise ValueError(f"Unknown wave type: {wave_type}")
+
+def _period_samples(freq, duration, points):
+    # Samples per input period when the grid holds a whole number of them exactly, else None
+    if points < 2 or freq <= 0 or duration <= 0:
+        return None
+    per_period = (points - 1) / (duration * freq)
+    n = round(per_period)
+    return n if 2 <= n < points and abs(per_period - n) < 1e-9 * per_period else None
+
+def _periodic(func, t, freq, duration):
+    # func(t) over the grid; on a period-aligned grid one period is evaluated and tiled
+    period = _period_samples(freq, duration, len(t))
+    return func(t) if period is None else np.resize(func(t[:period]), len(t))
+
+# Largest grid the basis caches keep: t, unit and slope take 6 MB here, so eight cached grids
+# hold about 50 MB at most. Larger grids are rebuilt per call; cached_waveforms holds their results
+_BASIS_CACHE_POINTS = 1 << 18
+
+def _grid_cache(func):
+    # lru_cache for func(wave_type, freq, duration, points) that skips grids above
+    # _BASIS_CACHE_POINTS, since lru_cache bounds the number of entries, not their size
+    cached = functools.lru_cache(maxsize=8)(func)
+
+    @functools.wraps(func)
+    def wrapper(wave_type, freq, duration, points):
+        if points > _BASIS_CACHE_POINTS:
+            return func(wave_type, freq, duration, points)
+        return cached(wave_type, freq, duration, points)
+
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.cache_info = cached.cache_info
+    return wrapper
+
+@_grid_cache
+def _unit_basis(wave_type, freq, duration, points):
+    # (t, unit waveform) for generate_waveforms, built once per grid and shared read-only
+    t = np.linspace(0, duration, points)
+    unit = _periodic(lambda t: _unit_wave(t, freq, wave_type), t, freq, duration)
+    t.flags.writeable = False
+    unit.flags.writeable = False
+    return t, unit
+
+@_grid_cache
+def _unit_slope_basis(wave_type, freq, duration, points):
+    # d/dt of _unit_basis's waveform on the same grid, for the differentiator
+    t, _ = _unit_basis(wave_type, freq, duration, points)
+    slope = _periodic(lambda t_: _unit_slope(t_, freq, wave_type, t[1] - t[0]), t, freq, duration)
+    slope.flags.writeable = False
+    return slope
+
+class Config(str, enum.Enum):
+    """
+    The supported circuits. Members compare and hash equal to their names, so either can be
+    used wherever a configuration is expected. Entry points normalize with _config(); str() of
+    a member is "Config.INVERTING" on Python 3.11+, never use it to get the name.
+    """
+    INVERTING = "Inverting"
+    NON_INVERTING = "Non-Inverting"
+    VOLTAGE_FOLLOWER = "Voltage Follower"
+    INTEGRATOR = "Integrator"
+    DIFFERENTIATOR = "Differentiator"
+    SUMMING = "Summing Amplifier"
+    DIFFERENCE = "Difference Amplifier"
+
+CONFIG_TYPES = [c.value for c in Config]
+
+def _config(config_type):
+    # The Config member for a member or its name
+    try:
+        return Config(config_type)
+    except ValueError:
+        raise ValueError(f"Unknown configuration: {config_type}") from None
+
+# Harmonic k of each input shape falls off as k**-p (None: a single tone)
+_HARMONIC_DECAY = {"Sine": None, "Triangle": 2, "Square": 1}
+MAX_AUTO_POINTS = 1000000
+MIN_SAMPLES_PER_PERIOD = 16 # Below this a waveform aliases (2 per period can land on every zero of a sine)
+
+def _samples_per_period(config_type, wave_type):
+    p = _HARMONIC_DECAY[wave_type]
+    if p is None:
+        return 64
+    # Integrating divides harmonic k by k, differentiating multiplies by it
+    p += {Config.INTEGRATOR: 1, Config.DIFFERENTIATOR: -1}.get(config_type, 0)
+    if p <= 0: # Impulses at a Square's edges: only the sample spacing bounds them
+        return 1024
+    # Resolve harmonics down to 1% of the fundamental, at 4 samples per cycle of the highest one
+    return max(64, 2 ** int(np.ceil(np.log2(4 * 100 ** (1 / p)))))
+
+def auto_points(config_type, freq, duration, wave_type, tau=None):
+    """
+    Sample count for `duration` seconds of a `wave_type` input at `freq`: a whole number of
+    samples per period (more for harmonic-rich inputs and outputs, and at least 8 per time
+    constant tau when that is shorter than a period), lowered as far as MIN_SAMPLES_PER_PERIOD
+    to stay within MAX_AUTO_POINTS. Whole periods let the periodic fast paths evaluate one
+    period and tile it; less than a period still gets a full period's worth of samples.
+    Raises ValueError when even MIN_SAMPLES_PER_PERIOD would exceed the cap.
+    """
+    if freq <= 0:
+        raise ValueError(f"freq must be > 0, got {freq}")
+    if duration <= 0:
+        raise ValueError(f"duration must be > 0, got {duration}")
+    per_period = _samples_per_period(config_type, wave_type)
+    if tau:
+        per_period = max(per_period, int(np.ceil(8 / (freq * tau))))
+    periods = duration * freq
+    if periods * MIN_SAMPLES_PER_PERIOD + 1 > MAX_AUTO_POINTS:
+        raise ValueError(f"{duration} s at {freq} Hz needs more than {MAX_AUTO_POINTS} points at "
+                         f"{MIN_SAMPLES_PER_PERIOD} per period; shorten the duration or pass points explicitly")
+    per_period = min(per_period, int((MAX_AUTO_POINTS - 1) / periods))
+    samples = int(round(periods * per_period)) if periods >= 1 else per_period
+    return min(samples, MAX_AUTO_POINTS - 1) + 1
+
+# Output of the configurations that depend only on the present input sample
+_MEMORYLESS = {
+    Config.INVERTING: lambda R_in, R_f, R_in2, v, v2: v * (-R_f / R_in),
+    Config.NON_INVERTING: lambda R_in, R_f, R_in2, v, v2: v * (1 + R_f / R_in),
+    Config.VOLTAGE_FOLLOWER: lambda R_in, R_f, R_in2, v, v2: v,
+    Config.SUMMING: lambda R_in, R_f, R_in2, v, v2: -R_f * (v/R_in + v2/R_in2),
+    # Vout = (Rf/Rin) * (V2 - V1)
+    Config.DIFFERENCE: lambda R_in, R_f, R_in2, v, v2: (R_f / R_in) * (v2 - v),
+}
+
+def _memoryless_output(config_type, R_in, R_f, R_in2, vin_ac, vin_ac2):
+    output = _MEMORYLESS.get(config_type)
+    return output(R_in, R_f, R_in2, vin_ac, vin_ac2) if output else np.zeros_like(vin_ac)
+
+def _integrate(vin_ac, R_in, C, dt):
+    # Vout = -1/(RC) * integral(Vin), numerical integration along the last axis
+    vout = -1 / (R_in * C) * np.cumsum(vin_ac, axis=-1) * dt
+    # Center it (remove integration constant drift for display)
+    return vout - np.mean(vout, axis=-1, keepdims=True)
+
+# --- Scalar strategies ---
+# One function per configuration fills in a solver's operating point. They are the scalar
+# counterparts of the _batch_* kernels below and use plain float arithmetic; V_out is kept a
+# NumPy float so a zero resistor gives inf/NaN currents instead of raising.
+
+def _clip(x, v_cc):
+    return np.float64(min(max(x, -v_cc), v_cc))
+
+def _scalar_loop_factor(a_ol, beta):
+    loop_gain = a_ol * beta
+    return loop_gain / (1 + loop_gain)
+
+def _solve_inverting(s):
+    s.beta = s.R_in / (s.R_in + s.R_f)
+    s.ideal_gain = -s.R_f / s.R_in
+    s.actual_gain = s.ideal_gain * _scalar_loop_factor(s.A_ol, s.beta)
+    s.V_out = _clip(s.V_in * s.actual_gain, s.V_cc)
+    # (-) is set by the resistor network and Vout (no input current), so it sits slightly
+    # off the ideal virtual short when A_ol is finite
+    s.V_plus = 0
+    s.V_minus = (s.V_in * s.R_f + s.V_out * s.R_in) / (s.R_in + s.R_f)
+    s.I_in = (s.V_in - s.V_minus) / s.R_in
+    s.I_f = (s.V_minus - s.V_out) / s.R_f
+    s.I_Rin = s.I_in
+
+def _solve_non_inverting(s):
+    s.beta = s.R_in / (s.R_in + s.R_f)
+    s.ideal_gain = 1 + (s.R_f / s.R_in)
+    s.actual_gain = s.ideal_gain * _scalar_loop_factor(s.A_ol, s.beta)
+    s.V_out = _clip(s.V_in * s.actual_gain, s.V_cc)
+    s.V_plus = s.V_in
+    s.V_minus = s.V_out * s.beta # Divider Rf/Rin
+    s.I_in = 0
+    s.I_f = (s.V_minus - s.V_out) / s.R_f
+    s.I_Rin = s.V_minus / s.R_in
+
+def _solve_voltage_follower(s):
+    s.beta = 1.0
+    s.ideal_gain = 1.0
+    s.actual_gain = s.ideal_gain * _scalar_loop_factor(s.A_ol, s.beta)
+    s.V_out = _clip(s.V_in * s.actual_gain, s.V_cc)
+    s.V_plus = s.V_in
+    s.V_minus = s.V_out
+    s.I_in = 0
+    s.I_f = 0
+    s.I_Rin = 0
+
+def _solve_integrator(s):
+    # DC: capacitor is open, so there is no feedback path and the gain is limited by A_ol;
+    # any DC input saturates the output
+    s.beta = 0.0
+    s.ideal_gain = 0
+    s.actual_gain = -s.A_ol
+    s.V_out = _clip(s.V_in * s.actual_gain, s.V_cc)
+    s.V_plus = 0
+    s.V_minus = 0 # Virtual Ground approximation
+    s.I_in = 0
+    s.I_f = (s.V_minus - s.V_out) / s.R_f
+    s.I_Rin = s.V_minus / s.R_in
+
+def _solve_differentiator(s):
+    # DC: input capacitor open, Rf ties Vout to (-); DC gain is 0
+    s.beta = 1.0
+    s.ideal_gain = 0
+    s.actual_gain = s.ideal_gain * _scalar_loop_factor(s.A_ol, s.beta)
+    s.V_out = _clip(0, s.V_cc)
+    s.V_plus = 0
+    s.V_minus = 0 # Virtual Ground approximation
+    s.I_in = 0
+    s.I_f = (s.V_minus - s.V_out) / s.R_f
+    s.I_Rin = s.V_minus / s.R_in
+
+def _solve_summing(s):
+    # Both input resistors load the summing node: Rin || Rin2
+    r_par = s.R_in * s.R_in2 / (s.R_in + s.R_in2)
+    s.beta = r_par / (r_par + s.R_f)
+    # Vout = -Rf * (V1/R1 + V2/R2); the stored gain is the factor -Rf/Rin for V1
+    s.ideal_gain = -s.R_f / s.R_in
+    loop_factor = _scalar_loop_factor(s.A_ol, s.beta)
+    s.actual_gain = s.ideal_gain * loop_factor
+    s.V_out = _clip(-s.R_f * (s.V_in/s.R_in + s.V_in2/s.R_in2) * loop_factor, s.V_cc)
+    s.V_plus = 0
+    # Node equation multiplied through by Rf (stays finite for Rf = 0)
+    s.V_minus = (s.R_f * (s.V_in/s.R_in + s.V_in2/s.R_in2) + s.V_out) / (s.R_f * (1/s.R_in + 1/s.R_in2) + 1)
+    s.I_in = (s.V_in - s.V_minus) / s.R_in # I1
+    s.I_f = (s.V_minus - s.V_out) / s.R_f
+    s.I_Rin = 0
+
+def _solve_difference(s):
+    s.beta = s.R_in / (s.R_in + s.R_f)
+    # Differential gain Vout / (V2 - V1), with V1 = V_in (inverting) and V2 = V_in2
+    s.ideal_gain = s.R_f / s.R_in
+    s.actual_gain = s.ideal_gain * _scalar_loop_factor(s.A_ol, s.beta)
+    s.V_out = _clip(s.actual_gain * (s.V_in2 - s.V_in), s.V_cc)
+    s.V_plus = s.V_in2 * (s.R_f / (s.R_in + s.R_f))
+    s.V_minus = (s.V_in * s.R_f + s.V_out * s.R_in) / (s.R_in + s.R_f)
+    s.I_in = (s.V_in - s.V_minus) / s.R_in
+    s.I_f = (s.V_minus - s.V_out) / s.R_f
+    s.I_Rin = 0
+
+_SCALAR_SOLVERS = {
+    Config.INVERTING: _solve_inverting,
+    Config.NON_INVERTING: _solve_non_inverting,
+    Config.VOLTAGE_FOLLOWER: _solve_voltage_follower,
+    Config.INTEGRATOR: _solve_integrator,
+    Config.DIFFERENTIATOR: _solve_differentiator,
+    Config.SUMMING: _solve_summing,
+    Config.DIFFERENCE: _solve_difference,
+}
+
+def _memoryless_wave(config):
+    output = _MEMORYLESS[config]
+    return lambda s, v, v2, dt, grid: output(s.R_in, s.R_f, s.R_in2, v, v2)
+
+# Ideal (unclipped) output waveform: (solver, vin, vin2, dt, _unit_basis grid key) -> vout
+_WAVE_OUTPUTS = {
+    Config.INTEGRATOR: lambda s, v, v2, dt, grid: _integrate(v, s.R_in, s.C, dt),
+    # Vout = -RC * dVin/dt, from the input's exact slope
+    Config.DIFFERENTIATOR: lambda s, v, v2, dt, grid: -s.R_f * s.C * s.V_in * _unit_slope_basis(*grid),
+    **{config: _memoryless_wave(config) for config in _MEMORYLESS},
+}
+
+# Time constant of the feedback network, which sets auto_points' resolution (None: no RC)
+_TIME_CONSTANTS = {
+    Config.INTEGRATOR: lambda s: s.R_in * s.C,
+    Config.DIFFERENTIATOR: lambda s: s.R_f * s.C,
+    **{config: lambda s: None for config in _MEMORYLESS},
+}
+
+# Closed-loop bandwidth (Hz) of a solved circuit for simulate_transient: (solver, GBW) -> Hz
+_BANDWIDTHS = {
+    # Capacitor shorts the feedback at high frequency: full GBW
+    Config.INTEGRATOR: lambda s, GBW: GBW,
+    # Feedback zero at 1/(2*pi*Rf*C) meets the op-amp roll-off
+    Config.DIFFERENTIATOR: lambda s, GBW: np.sqrt(GBW / (2 * np.pi * s.R_f * s.C)),
+    **{config: lambda s, GBW: GBW * s.beta for config in _MEMORYLESS},
+}
+
+def _stream_integrator(s, unit, slope, points, block_size, dt):
+    # Display centering subtracts the mean of the running sum, which is
+    # sum_j vin[j] * (points - j) / points: one input-only pass, constant memory
+    weighted = 0.0
+    for start in range(0, points, block_size):
+        stop = min(start + block_size, points)
+        weighted += np.dot(s.V_in * unit(start, stop), points - np.arange(start, stop, dtype=float))
+    offset = weighted / points
+    running = 0.0
+
+    def output(start, stop, vin_ac, vin_ac2):
+        nonlocal running
+        sums = running + np.cumsum(vin_ac)
+        running = sums[-1]
+        return -1 / (s.R_in * s.C) * (sums - offset) * dt
+    return output
+
+def _stream_differentiator(s, unit, slope, points, block_size, dt):
+    # The slope is known per sample, so blocks need no overlap
+    return lambda start, stop, vin_ac, vin_ac2: -s.R_f * s.C * s.V_in * slope(start, stop)
+
+def _stream_memoryless(config):
+    output = _MEMORYLESS[config]
+    return lambda s, unit, slope, points, block_size, dt: (
+        lambda start, stop, vin_ac, vin_ac2: output(s.R_in, s.R_f, s.R_in2, vin_ac, vin_ac2))
+
+# Ideal output for stream_waveforms, block by block: (solver, unit(start, stop), slope(start, stop),
+# points, block_size, dt) -> output(start, stop, vin, vin2), called on successive blocks
+_STREAM_OUTPUTS = {
+    Config.INTEGRATOR: _stream_integrator,
+    Config.DIFFERENTIATOR: _stream_differentiator,
+    **{config: _stream_memoryless(config) for config in _MEMORYLESS},
+}
+
 class OpAmpSolver:
+    # Fixed attribute layout: no per-instance __dict__, and the strategies for the
+    # configuration are looked up once here instead of on every call
+    __slots__ = ("config_type", "R_in", "R_f", "V_in", "V_cc", "A_ol", "C", "V_in2", "R_in2",
+                 "ideal_gain", "actual_gain", "beta", "noise_gain", "V_out", "V_minus", "V_plus",
+                 "I_in", "I_f", "I_Rin", "_solve", "_wave_output", "_time_constant", "_bandwidth",
+                 "_stream_output")
+
     def __init__(self, config_type, R_in, R_f, V_in, V_cc, A_ol=100000, C=1e-6, V_in2=0, R_in2=10000):
-        self.config_type = config_type
+        config = _config(config_type)
+        self.config_type = config.value
         self.R_in = R_in
         self.R_f = R_f
         self.V_in = V_in
@@ -11,11 +359,13 @@ class OpAmpSolver:
         self.C = C
         self.V_in2 = V_in2
         self.R_in2 = R_in2
+        self._bind(config)
         
         # Default values
         self.ideal_gain = 0
         self.actual_gain = 0
         self.beta = 0
+        self.noise_gain = 0
         self.V_out = 0
         self.V_minus = 0
         self.V_plus = 0
@@ -23,133 +373,123 @@ class OpAmpSolver:
         self.I_f = 0
         self.I_Rin = 0
 
+    def __getstate__(self):
+        # Strategies are resolved again from config_type when unpickling
+        return {name: getattr(self, name) for name in self.__slots__ if not name.startswith("_")}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._bind(Config(state["config_type"]))
+
+    def _bind(self, config):
+        self._solve = _SCALAR_SOLVERS[config]
+        self._wave_output = _WAVE_OUTPUTS[config]
+        self._time_constant = _TIME_CONSTANTS[config]
+        self._bandwidth = _BANDWIDTHS[config]
+        self._stream_output = _STREAM_OUTPUTS[config]
+
     def calculate_parameters(self):
-        # Feedback Factor (Beta)
-        if self.config_type == "Non-Inverting":
-            self.beta = self.R_in / (self.R_in + self.R_f)
-        elif self.config_type == "Voltage Follower":
-            self.beta = 1.0
-        elif self.config_type in ["Inverting", "Summing Amplifier"]:
-            self.beta = self.R_in / (self.R_in + self.R_f) # Simplified for summing
-        else:
-            # Integrator/Differentiator frequency dependent, use DC approximation for static state
-            self.beta = 1.0 # Approximation
-
-        # Ideal Closed Loop Gain (DC / Static)
-        if self.config_type == "Inverting":
-            self.ideal_gain = -self.R_f / self.R_in
-        elif self.config_type == "Non-Inverting":
-            self.ideal_gain = 1 + (self.R_f / self.R_in)
-        elif self.config_type == "Voltage Follower":
-            self.ideal_gain = 1.0
-        elif self.config_type == "Summing Amplifier":
-            # Vout = -Rf * (V1/R1 + V2/R2)
-            # Gain isn't a single number relative to V1, but let's store the factor -Rf/Rin
-            self.ideal_gain = -self.R_f / self.R_in 
+        # Beta (fraction of Vout fed back to (-)), ideal and finite-A_ol gain, Vout, nodes, currents
+        self._solve(self)
+        self.noise_gain = 1 / self.beta if self.beta > 0 else float("inf")
+
+    def auto_points(self, freq=1.0, duration=2.0, wave_type="Sine", tau=None):
+        # Sample count used when points=None; the feedback RC sets the time scale where there is
+        # one, and `tau` adds another (the shorter of the two wins)
+        taus = [tau, self._time_constant(self)]
+        taus = [t for t in taus if t]
+        return auto_points(self.config_type, freq, duration, wave_type, tau=min(taus) if taus else None)
+
+    def generate_waveforms(self, freq=1.0, duration=2.0, points=None, wave_type="Sine"):
+        """
+        (t, vin, vout) over `duration` seconds; points=None picks the sample count with auto_points.
+        On a period-aligned grid the memoryless configurations compute one period and tile it,
+        so a long multi-period display costs about as much as a single period.
+        """
+        points = self.auto_points(freq, duration, wave_type) if points is None else int(points)
+        period = _period_samples(float(freq), float(duration), points)
+        if period and self.config_type in _MEMORYLESS:
+            grid = (wave_type, float(freq), float(duration), points)
+            t, unit = _unit_basis(*grid)
+            vin_ac, vin_ac2 = self.V_in * unit[:period], self.V_in2 * unit[:period]
+            vout_ac = np.clip(self._wave_output(self, vin_ac, vin_ac2, t[1] - t[0], grid), -self.V_cc, self.V_cc)
+            return t, np.resize(vin_ac, points), np.resize(vout_ac, points)
+
+        t, vin_ac, vout_ideal = self._ideal_waveforms(freq, duration, points, wave_type)
+        vout_ac = np.clip(vout_ideal, -self.V_cc, self.V_cc)
         
-        # Static Output Calculation
-        if self.config_type == "Summing Amplifier":
-            raw_vout = -self.R_f * (self.V_in/self.R_in + self.V_in2/self.R_in2)
-        elif self.config_type == "Difference Amplifier":
-            # Vout = (Rf/Rin) * (V2 - V1)
-            # V1 = V_in (Inverting), V2 = V_in2 (Non-Inverting)
-            raw_vout = (self.R_f / self.R_in) * (self.V_in2 - self.V_in)
-        elif self.config_type == "Integrator":
-            # DC Gain is infinite (capacitor open), practically limited by A_ol
-            raw_vout = -self.A_ol * (self.V_in - 0) # Saturation likely
-        elif self.config_type == "Differentiator":
-            # DC Gain is 0 (capacitor open blocks DC)
-            raw_vout = 0
-        else:
-            raw_vout = self.V_in * self.ideal_gain # Using ideal for simplicity in static view
-
-        self.V_out = np.clip(raw_vout, -self.V_cc, self.V_cc)
-        self.actual_gain = self.ideal_gain # Placeholder for complex types
-
-        # Node Voltages (Simplified for new modes)
-        if self.config_type in ["Inverting", "Integrator", "Differentiator", "Summing Amplifier"]:
-            self.V_plus = 0
-            self.V_minus = 0 # Virtual Ground approximation
-        elif self.config_type == "Difference Amplifier":
-            # V_plus = V2 * (Rf / (Rin + Rf))
-            self.V_plus = self.V_in2 * (self.R_f / (self.R_in + self.R_f))
-            self.V_minus = self.V_plus # Virtual Short
-        else:
-            self.V_plus = self.V_in
-            self.V_minus = self.V_in # Virtual Short
-
-        # Currents
-        if self.config_type == "Inverting":
-            self.I_in = (self.V_in - self.V_minus) / self.R_in
-            self.I_f = (self.V_minus - self.V_out) / self.R_f
-            self.I_Rin = self.I_in
-        elif self.config_type == "Voltage Follower":
-            self.I_in = 0
-            self.I_f = 0
-            self.I_Rin = 0
-        elif self.config_type == "Summing Amplifier":
-            self.I_in = (self.V_in - self.V_minus) / self.R_in # I1
-            # I2 would be (V_in2 - V_minus) / R_in2
-            self.I_f = (self.V_minus - self.V_out) / self.R_f
-        elif self.config_type == "Difference Amplifier":
-            self.I_in = (self.V_in - self.V_minus) / self.R_in
-            self.I_f = (self.V_minus - self.V_out) / self.R_f
-        else:
-            self.I_in = 0 
-            self.I_f = (self.V_minus - self.V_out) / self.R_f
-            self.I_Rin = self.V_minus / self.R_in
+        return t, vin_ac, vout_ac
 
-    def generate_waveforms(self, freq=1.0, duration=2.0, points=1000, wave_type="Sine"):
-        t = np.linspace(0, duration, points)
+    def simulate_transient(self, freq=1.0, duration=2.0, points=None, wave_type="Sine", GBW=1e6, slew_rate=0.5e6):
+        """
+        Like generate_waveforms, but the output follows the ideal waveform through the op-amp's
+        dynamics: a first-order lag at the closed-loop bandwidth, slew-rate limit (V/s) and
+        rail saturation carried as state, so recovery from clipping takes time.
+        """
+        self.calculate_parameters()
+        bandwidth = self._bandwidth(self, GBW)
         
-        # Generate Input Waveform
-        if wave_type == "Sine":
-            vin_ac = self.V_in * np.sin(2 * np.pi * freq * t)
-            vin_ac2 = self.V_in2 * np.sin(2 * np.pi * freq * t) # For adder/subtractor
-        elif wave_type == "Square":
-            vin_ac = self.V_in * np.sign(np.sin(2 * np.pi * freq * t))
-            vin_ac2 = self.V_in2 * np.sign(np.sin(2 * np.pi * freq * t))
-        elif wave_type == "Triangle":
-            vin_ac = self.V_in * (2 * np.abs(2 * (t * freq - np.floor(t * freq + 0.5))) - 1)
-            vin_ac2 = self.V_in2 * (2 * np.abs(2 * (t * freq - np.floor(t * freq + 0.5))) - 1)
+        if points is None:
+            # Resolve the lag and a rail-to-rail slew as well as the input
+            taus = [t for t in (1 / (2 * np.pi * bandwidth) if bandwidth > 0 else None,
+                                self.V_cc / slew_rate if slew_rate > 0 else None) if t]
+            points = self.auto_points(freq, duration, wave_type, tau=min(taus) if taus else None)
+        t, vin_ac, vout_ideal = self._ideal_waveforms(freq, duration, int(points), wave_type)
         
-        # Calculate Output Waveform
-        if self.config_type == "Integrator":
-            # Vout = -1/(RC) * integral(Vin)
-            # Numerical integration
-            dt = t[1] - t[0]
-            vout_ideal = -1 / (self.R_in * self.C) * np.cumsum(vin_ac) * dt
-            # Center it (remove integration constant drift for display)
-            vout_ideal -= np.mean(vout_ideal)
-            
-        elif self.config_type == "Differentiator":
-            # Vout = -RC * dVin/dt
-            # Numerical differentiation
-            dt = t[1] - t[0]
-            vout_ideal = -self.R_f * self.C * np.gradient(vin_ac, dt)
-            
-        elif self.config_type == "Summing Amplifier":
-            vout_ideal = -self.R_f * (vin_ac/self.R_in + vin_ac2/self.R_in2)
-            
-        elif self.config_type == "Difference Amplifier":
-             # Vout = (Rf/Rin) * (V2 - V1)
-             vout_ideal = (self.R_f / self.R_in) * (vin_ac2 - vin_ac)
-            
-        elif self.config_type == "Inverting":
-            vout_ideal = vin_ac * (-self.R_f / self.R_in)
-            
-        elif self.config_type == "Non-Inverting":
-            vout_ideal = vin_ac * (1 + self.R_f / self.R_in)
-            
-        elif self.config_type == "Voltage Follower":
-            vout_ideal = vin_ac
-            
-        else:
-            vout_ideal = np.zeros_like(t)
+        vout = transient_response(vout_ideal, t[1] - t[0], bandwidth, slew_rate, self.V_cc)
+        return t, vin_ac, vout
 
-        vout_ac = np.clip(vout_ideal, -self.V_cc, self.V_cc)
+    def stream_waveforms(self, freq=1.0, duration=2.0, points=None, wave_type="Sine", block_size=65536):
+        """
+        Generator version of generate_waveforms: yields (t, vin, vout) blocks of at most
+        block_size samples on the same time grid, so memory stays constant for any `points`.
+        Integrator state is carried across block boundaries.
+        """
+        points = self.auto_points(freq, duration, wave_type) if points is None else int(points)
+        dt = duration / (points - 1)
+        period = _period_samples(float(freq), float(duration), points)
+        unit_wave = lambda t: _unit_wave(t, freq, wave_type)
+        unit_slope = lambda t: _unit_slope(t, freq, wave_type, dt)
+        tables = {}
         
-        return t, vin_ac, vout_ac
+        def block_time(start, stop):
+            # Same samples as np.linspace(0, duration, points)
+            t = np.arange(start, stop) * dt
+            if stop == points:
+                t[-1] = duration
+            return t
+        
+        def sample(func, start, stop):
+            # func on samples [start, stop); a period-aligned grid reads one period, as _unit_basis tiles it
+            if period is None:
+                return func(block_time(start, stop))
+            if func not in tables:
+                tables[func] = func(block_time(0, period))
+            return tables[func][np.arange(start, stop) % period]
+        
+        output = self._stream_output(self, lambda start, stop: sample(unit_wave, start, stop),
+                                     lambda start, stop: sample(unit_slope, start, stop), points, block_size, dt)
+        for start in range(0, points, block_size):
+            stop = min(start + block_size, points)
+            t = block_time(start, stop)
+            unit = sample(unit_wave, start, stop)
+            vin_ac, vin_ac2 = self.V_in * unit, self.V_in2 * unit
+            vout_ideal = output(start, stop, vin_ac, vin_ac2)
+            yield t, vin_ac, np.clip(vout_ideal, -self.V_cc, self.V_cc)
+
+    def _ideal_waveforms(self, freq, duration, points, wave_type):
+        # Shared read-only time grid and unit-amplitude input; amplitudes are just scalings
+        grid = (wave_type, float(freq), float(duration), int(points))
+        t, unit = _unit_basis(*grid)
+        vin_ac, vin_ac2 = self.V_in * unit, self.V_in2 * unit
+        
+        # Calculate Output Waveform
+        vout_ideal = self._wave_output(self, vin_ac, vin_ac2, t[1] - t[0], grid)
+        return t, vin_ac, vout_ideal
+
+    def ac_analysis(self, freqs, GBW=1e6):
+        return ac_analysis(self.config_type, freqs, self.R_in, self.R_f, C=self.C, R_in2=self.R_in2, A_ol=self.A_ol, GBW=GBW)
 
     def get_state(self):
         return {
@@ -162,3 +502,302 @@ class OpAmpSolver:
             "I_f": self.I_f,
             "V_minus": self.V_minus
         }
+
+
+# --- Vectorized batch solver ---
+# Each configuration maps to a function that evaluates the same static model as
+# OpAmpSolver.calculate_parameters, but on NumPy arrays (one element per design point).
+
+BATCH_FIELDS = ["beta", "noise_gain", "ideal_gain", "actual_gain", "V_out", "V_plus", "V_minus", "I_in", "I_f", "I_Rin"]
+
+def _loop_factor(p, beta):
+    # A*beta / (1 + A*beta): how close the finite-gain amplifier gets to the ideal gain
+    loop_gain = p["A_ol"] * beta
+    return loop_gain / (1 + loop_gain)
+
+def _batch_inverting(p):
+    beta = p["R_in"] / (p["R_in"] + p["R_f"])
+    ideal_gain = -p["R_f"] / p["R_in"]
+    actual_gain = ideal_gain * _loop_factor(p, beta)
+    v_out = np.clip(p["V_in"] * actual_gain, -p["V_cc"], p["V_cc"])
+    v_minus = (p["V_in"] * p["R_f"] + v_out * p["R_in"]) / (p["R_in"] + p["R_f"])
+    i_in = (p["V_in"] - v_minus) / p["R_in"]
+    return {"beta": beta, "ideal_gain": ideal_gain, "actual_gain": actual_gain, "V_out": v_out,
+            "V_plus": np.zeros_like(v_out), "V_minus": v_minus,
+            "I_in": i_in, "I_f": (v_minus - v_out) / p["R_f"], "I_Rin": i_in}
+
+def _batch_non_inverting(p):
+    beta = p["R_in"] / (p["R_in"] + p["R_f"])
+    ideal_gain = 1 + p["R_f"] / p["R_in"]
+    actual_gain = ideal_gain * _loop_factor(p, beta)
+    v_out = np.clip(p["V_in"] * actual_gain, -p["V_cc"], p["V_cc"])
+    v_minus = v_out * beta
+    return {"beta": beta, "ideal_gain": ideal_gain, "actual_gain": actual_gain, "V_out": v_out,
+            "V_plus": p["V_in"], "V_minus": v_minus,
+            "I_in": np.zeros_like(v_out), "I_f": (v_minus - v_out) / p["R_f"], "I_Rin": v_minus / p["R_in"]}
+
+def _batch_voltage_follower(p):
+    beta = np.ones_like(p["V_in"])
+    actual_gain = _loop_factor(p, beta)
+    v_out = np.clip(p["V_in"] * actual_gain, -p["V_cc"], p["V_cc"])
+    zero = np.zeros_like(v_out)
+    return {"beta": beta, "ideal_gain": beta, "actual_gain": actual_gain, "V_out": v_out,
+            "V_plus": p["V_in"], "V_minus": v_out, "I_in": zero, "I_f": zero, "I_Rin": zero}
+
+def _batch_integrator(p):
+    # DC: capacitor is open, no feedback, gain practically limited by A_ol
+    actual_gain = -p["A_ol"] + np.zeros_like(p["V_in"])
+    v_out = np.clip(p["V_in"] * actual_gain, -p["V_cc"], p["V_cc"])
+    zero = np.zeros_like(v_out)
+    return {"beta": zero, "ideal_gain": zero, "actual_gain": actual_gain, "V_out": v_out,
+            "V_plus": zero, "V_minus": zero, "I_in": zero, "I_f": (zero - v_out) / p["R_f"], "I_Rin": zero / p["R_in"]}
+
+def _batch_differentiator(p):
+    # DC Gain is 0 (capacitor open blocks DC)
+    v_out = np.clip(np.zeros_like(p["V_in"]), -p["V_cc"], p["V_cc"])
+    zero = np.zeros_like(v_out)
+    return {"beta": zero + 1.0, "ideal_gain": zero, "actual_gain": zero, "V_out": v_out,
+            "V_plus": zero, "V_minus": zero, "I_in": zero, "I_f": (zero - v_out) / p["R_f"], "I_Rin": zero / p["R_in"]}
+
+def _batch_summing(p):
+    r_par = p["R_in"] * p["R_in2"] / (p["R_in"] + p["R_in2"])
+    beta = r_par / (r_par + p["R_f"])
+    ideal_gain = -p["R_f"] / p["R_in"]
+    loop_factor = _loop_factor(p, beta)
+    raw_vout = -p["R_f"] * (p["V_in"] / p["R_in"] + p["V_in2"] / p["R_in2"]) * loop_factor
+    v_out = np.clip(raw_vout, -p["V_cc"], p["V_cc"])
+    v_minus = (p["R_f"] * (p["V_in"] / p["R_in"] + p["V_in2"] / p["R_in2"]) + v_out) / (p["R_f"] * (1 / p["R_in"] + 1 / p["R_in2"]) + 1)
+    return {"beta": beta, "ideal_gain": ideal_gain, "actual_gain": ideal_gain * loop_factor, "V_out": v_out,
+            "V_plus": np.zeros_like(v_out), "V_minus": v_minus,
+            "I_in": (p["V_in"] - v_minus) / p["R_in"], "I_f": (v_minus - v_out) / p["R_f"], "I_Rin": np.zeros_like(v_out)}
+
+def _batch_difference(p):
+    beta = p["R_in"] / (p["R_in"] + p["R_f"])
+    ideal_gain = p["R_f"] / p["R_in"]
+    actual_gain = ideal_gain * _loop_factor(p, beta)
+    v_out = np.clip(actual_gain * (p["V_in2"] - p["V_in"]), -p["V_cc"], p["V_cc"])
+    v_plus = p["V_in2"] * (p["R_f"] / (p["R_in"] + p["R_f"]))
+    v_minus = (p["V_in"] * p["R_f"] + v_out * p["R_in"]) / (p["R_in"] + p["R_f"])
+    return {"beta": beta, "ideal_gain": ideal_gain, "actual_gain": actual_gain, "V_out": v_out,
+            "V_plus": v_plus, "V_minus": v_minus,
+            "I_in": (p["V_in"] - v_minus) / p["R_in"], "I_f": (v_minus - v_out) / p["R_f"], "I_Rin": np.zeros_like(v_out)}
+
+_BATCH_SOLVERS = {
+    Config.INVERTING: _batch_inverting,
+    Config.NON_INVERTING: _batch_non_inverting,
+    Config.VOLTAGE_FOLLOWER: _batch_voltage_follower,
+    Config.INTEGRATOR: _batch_integrator,
+    Config.DIFFERENTIATOR: _batch_differentiator,
+    Config.SUMMING: _batch_summing,
+    Config.DIFFERENCE: _batch_difference,
+}
+
+def _config_codes(config_type):
+    # solve_batch's config_type as integer indices into CONFIG_TYPES
+    if isinstance(config_type, str): # A name or a Config member
+        return np.asarray(CONFIG_TYPES.index(_config(config_type).value))
+    configs = np.asarray(config_type)
+    if configs.dtype.kind in "iu":
+        return configs
+    if not isinstance(config_type, np.ndarray):
+        # NumPy would store a Config member as str(member): normalize each entry first
+        configs = np.array(config_type, dtype=object)
+        configs = np.frompyfunc(lambda c: _config(c).value, 1, 1)(configs).astype(str)
+    codes = np.full(configs.shape, -1)
+    for code, name in enumerate(CONFIG_TYPES):
+        codes[configs == name] = code
+    if (codes < 0).any():
+        raise ValueError(f"Unknown configuration: {configs[codes < 0][0]}")
+    return codes
+
+def solve_batch(config_type, R_in, R_f, V_in, V_cc, A_ol=100000, C=1e-6, V_in2=0, R_in2=10000):
+    """
+    Vectorized counterpart of OpAmpSolver.calculate_parameters.
+    All numeric arguments (and config_type) broadcast against each other. config_type is a
+    name or Config member, an array of them, or an integer array indexing CONFIG_TYPES (fastest
+    for mixed sweeps). Returns a dict of float arrays keyed like the solver attributes (see BATCH_FIELDS).
+    """
+    names = ["R_in", "R_f", "V_in", "V_cc", "A_ol", "C", "V_in2", "R_in2"]
+    values = [np.asarray(v, dtype=float) for v in (R_in, R_f, V_in, V_cc, A_ol, C, V_in2, R_in2)]
+    configs = _config_codes(config_type)
+    shape = np.broadcast_shapes(configs.shape, *[v.shape for v in values])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if configs.ndim == 0:
+            code = int(configs)
+            if not 0 <= code < len(CONFIG_TYPES):
+                raise ValueError(f"Unknown configuration: {code}")
+            # Scalars stay 0-d so NumPy only does full-size work where an input varies
+            out = _BATCH_SOLVERS[Config(CONFIG_TYPES[code])](dict(zip(names, values)))
+            result = {k: np.array(np.broadcast_to(out[k], shape), dtype=float) for k in out}
+        else:
+            # Mixed configurations: solve each group on its own subset of points.
+            # Work on flat index lists; inputs that are scalars are passed through unchanged.
+            size = int(np.prod(shape))
+            configs = np.broadcast_to(configs, shape).ravel()
+            values = [v.reshape(()) if v.size == 1 else np.broadcast_to(v, shape).ravel() for v in values]
+            result = {k: np.zeros(size) for k in BATCH_FIELDS if k != "noise_gain"}
+            solved = 0
+            for code, name in enumerate(CONFIG_TYPES):
+                idx = np.flatnonzero(configs == code)
+                if idx.size == 0:
+                    continue
+                solved += idx.size
+                out = _BATCH_SOLVERS[Config(name)]({n: v if v.ndim == 0 else v.take(idx) for n, v in zip(names, values)})
+                for k in out:
+                    result[k][idx] = out[k]
+            if solved != size:
+                raise ValueError(f"Unknown configuration: {configs[(configs < 0) | (configs >= len(CONFIG_TYPES))][0]}")
+            result = {k: v.reshape(shape) for k, v in result.items()}
+
+        result["noise_gain"] = 1 / result["beta"]
+    return result
+
+def gain_curve(config_type, R_in, R_f, A_ol, R_in2=10000):
+    """
+    Closed-loop gain for a whole array of open-loop gains in one call (no output clipping).
+    """
+    return solve_batch(config_type, R_in, R_f, 0.0, np.inf, A_ol=A_ol, R_in2=R_in2)["actual_gain"]
+
+
+# --- Frequency-domain (AC) analysis ---
+# Single-pole op-amp: A(s) = A_ol / (1 + s/wp), with the pole placed so that A_ol * fp = GBW.
+# Feedback networks are written as admittances so DC (open capacitors) stays finite.
+
+def _inverting_response(a, y_in, y_f, y_other=0):
+    # Vout/Vin for an input admittance y_in into the (-) node, feedback y_f, extra load y_other
+    y_total = y_in + y_f + y_other
+    return -a * (y_in / y_total) / (1 + a * (y_f / y_total))
+
+def _divider(p):
+    # Fraction of Vout the Rf/Rin divider feeds back
+    return p["R_in"] / (p["R_in"] + p["R_f"])
+
+# Closed-loop transfer function: (open-loop gain a, s = j*omega, parameters p) -> H
+_AC_RESPONSES = {
+    Config.INVERTING: lambda a, s, p: _inverting_response(a, 1 / p["R_in"], 1 / p["R_f"]),
+    Config.INTEGRATOR: lambda a, s, p: _inverting_response(a, 1 / p["R_in"], s * p["C"]),
+    Config.DIFFERENTIATOR: lambda a, s, p: _inverting_response(a, s * p["C"], 1 / p["R_f"]),
+    # Response to V1; R_in2 loads the summing node
+    Config.SUMMING: lambda a, s, p: _inverting_response(a, 1 / p["R_in"], 1 / p["R_f"], 1 / p["R_in2"]),
+    Config.NON_INVERTING: lambda a, s, p: a / (1 + a * _divider(p)),
+    Config.VOLTAGE_FOLLOWER: lambda a, s, p: a / (1 + a),
+    # Response to the differential input V2 - V1 (matched pairs)
+    Config.DIFFERENCE: lambda a, s, p: a * (1 - _divider(p)) / (1 + a * _divider(p)),
+}
+
+def _bandwidth_3db(freqs, mag):
+    # Upper -3 dB corner relative to the peak of the sweep, log-interpolated; NaN if not reached
+    peak_idx = np.argmax(mag, axis=-1)
+    threshold = np.take_along_axis(mag, peak_idx[..., None], axis=-1) / np.sqrt(2)
+    below = (mag < threshold) & (np.arange(mag.shape[-1]) > peak_idx[..., None])
+    has_corner = below.any(axis=-1)
+    idx = np.where(has_corner, np.argmax(below, axis=-1), 1)
+    m1 = np.take_along_axis(mag, (idx - 1)[..., None], axis=-1)[..., 0]
+    m2 = np.take_along_axis(mag, idx[..., None], axis=-1)[..., 0]
+    f1, f2 = np.log(freqs[idx - 1]), np.log(freqs[idx])
+    th = np.log(threshold[..., 0])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(m1 != m2, (th - np.log(m1)) / (np.log(m2) - np.log(m1)), 0.0)
+        log_corner = f1 + frac * (f2 - f1)
+    # Rows without a corner hold meaningless values that could overflow exp: skip them
+    corner = np.full(has_corner.shape, np.nan)
+    corner[has_corner] = np.exp(log_corner[has_corner])
+    return corner
+
+def batch_waveforms(config_type, R_in, R_f, V_in, V_cc, C=1e-6, V_in2=0, R_in2=10000,
+                    freq=1.0, duration=2.0, points=1000, wave_type="Sine"):
+    """
+    Vectorized counterpart of OpAmpSolver.generate_waveforms for one configuration.
+    Component values and amplitudes broadcast to a batch shape; returns t (points,) and
+    vin, vout of shape batch_shape + (points,).
+    """
+    grid = (wave_type, float(freq), float(duration), int(points))
+    t, unit = _unit_basis(*grid)
+    R_in, R_f, V_in, V_cc, C, V_in2, R_in2 = [np.asarray(v, dtype=float)[..., np.newaxis]
+                                             for v in (R_in, R_f, V_in, V_cc, C, V_in2, R_in2)]
+    vin_ac, vin_ac2 = V_in * unit, V_in2 * unit
+
+    # The solver's own waveform strategy, given the broadcast arrays in place of its attributes
+    p = types.SimpleNamespace(R_in=R_in, R_f=R_f, V_in=V_in, C=C, R_in2=R_in2)
+    vout_ideal = _WAVE_OUTPUTS[_config(config_type)](p, vin_ac, vin_ac2, t[1] - t[0], grid)
+
+    shape = np.broadcast_shapes(R_in.shape, R_f.shape, V_in.shape, V_cc.shape, C.shape, V_in2.shape, R_in2.shape)[:-1] + t.shape
+    vout = np.clip(np.broadcast_to(vout_ideal, shape), -V_cc, V_cc)
+    return t, np.broadcast_to(vin_ac, shape), vout
+
+def ac_analysis(config_type, freqs, R_in, R_f, C=1e-6, R_in2=10000, A_ol=100000, GBW=1e6):
+    """
+    Small-signal frequency response of one configuration.
+    Component values (and A_ol, GBW) may be arrays; they broadcast against each other to a
+    batch shape, and results have shape batch_shape + (len(freqs),).
+    Returns a dict with the complex transfer function "H", "magnitude_db", "phase_deg" and the
+    upper -3 dB corner "bandwidth_3db" (batch_shape).
+    """
+    freqs = np.asarray(freqs, dtype=float)
+    names = ["R_in", "R_f", "C", "R_in2", "A_ol", "GBW"]
+    values = [np.asarray(v, dtype=float) for v in (R_in, R_f, C, R_in2, A_ol, GBW)]
+    batch_shape = np.broadcast_shapes(*[v.shape for v in values])
+    # Trailing axis for frequency
+    p = dict(zip(names, [v[..., np.newaxis] for v in values]))
+
+    s = 2j * np.pi * freqs
+    a = p["A_ol"] / (1 + s * p["A_ol"] / (2 * np.pi * p["GBW"]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        H = _AC_RESPONSES[_config(config_type)](a, s, p)
+    H = np.broadcast_to(H, batch_shape + freqs.shape)
+
+    mag = np.abs(H)
+    with np.errstate(divide="ignore"):
+        magnitude_db = 20 * np.log10(mag)
+    return {
+        "freq": freqs,
+        "H": H,
+        "magnitude_db": magnitude_db,
+        "phase_deg": np.degrees(np.angle(H)),
+        "bandwidth_3db": _bandwidth_3db(freqs, mag) if freqs.size > 1 else np.full(batch_shape, np.nan),
+    }
+
+
+# --- Time-domain transient engine ---
+
+def _transient_kernel(target, a, max_step, v_cc, v, out):
+    # Per sample: exact first-order lag toward the target, then slew and rail limits.
+    # Plain Python over lists, or compiled with numba when it is installed.
+    for i in range(len(target)):
+        step = (1.0 - a) * (target[i] - v)
+        if step > max_step:
+            step = max_step
+        elif step < -max_step:
+            step = -max_step
+        v += step
+        if v > v_cc:
+            v = v_cc
+        elif v < -v_cc:
+            v = -v_cc
+        out[i] = v
+    return v
+
+if njit is not None:
+    _transient_kernel = njit(cache=True)(_transient_kernel)
+
+def transient_response(target, dt, bandwidth, slew_rate, V_cc, v0=None):
+    """
+    Drives an op-amp output state toward the ideal waveform `target` sampled every dt seconds.
+    bandwidth is the closed-loop -3 dB frequency (Hz), slew_rate in V/s. The state starts at
+    v0 (default: the first target sample, clipped to the rails).
+    """
+    target = np.asarray(target, dtype=float)
+    if v0 is None:
+        v0 = min(max(float(target[0]), -V_cc), V_cc) if target.size else 0.0
+    a = float(np.exp(-2 * np.pi * bandwidth * dt))
+    max_step = float(slew_rate * dt)
+
+    if njit is not None:
+        out = np.empty_like(target)
+        _transient_kernel(target, a, max_step, float(V_cc), float(v0), out)
+        return out
+    out = [0.0] * target.size
+    _transient_kernel(target.tolist(), a, max_step, float(V_cc), float(v0), out)
+    return np.array(out)
+
@@ -0,0 +1,142 @@
+import numpy as np
+
+from opamp_physics import _MEMORYLESS, Config
+
+class GainStage:
+    """
+    A memoryless stage: out = clip(gain * x + offset, +/-V_cc). Summing and difference
+    amplifiers hold their second input at a DC level, which becomes the offset.
+    """
+    def __init__(self, gain, offset, V_cc):
+        self.gain = gain
+        self.offset = offset
+        self.V_cc = V_cc
+
+    def process(self, x, out):
+        np.multiply(x, self.gain, out=out)
+        if self.offset:
+            out += self.offset
+        np.clip(out, -self.V_cc, self.V_cc, out=out)
+
+    def reset(self):
+        pass
+
+class IntegratorStage:
+    """
+    out = -1/(R_in*C) * running integral of x, clipped. The running sum is carried across
+    blocks and starts from an uncharged capacitor (no display centering, unlike _integrate).
+    """
+    def __init__(self, R_in, C, V_cc, dt):
+        self.R_in, self.C, self.V_cc, self.dt = R_in, C, V_cc, dt
+        self.reset()
+
+    def process(self, x, out):
+        if not len(x):
+            return
+        np.cumsum(x, out=out)
+        out += self._sum
+        self._sum = float(out[-1])
+        out *= -self.dt / (self.R_in * self.C)
+        np.clip(out, -self.V_cc, self.V_cc, out=out)
+
+    def reset(self):
+        self._sum = 0.0
+
+class DifferentiatorStage:
+    """
+    out = -R_f*C * dx/dt, clipped. Uses a backward difference with the previous block's last
+    sample carried over, so block boundaries need no look-ahead; the very first sample is 0.
+    """
+    def __init__(self, R_f, C, V_cc, dt):
+        self.R_f, self.C, self.V_cc, self.dt = R_f, C, V_cc, dt
+        self.reset()
+
+    def process(self, x, out):
+        if not len(x):
+            return
+        # Read both ends before writing: out may alias x
+        first = x[0] - (x[0] if self._prev is None else self._prev)
+        self._prev = x[-1]
+        np.subtract(x[1:], x[:-1], out=out[1:])
+        out[0] = first
+        out *= -self.R_f * self.C / self.dt
+        np.clip(out, -self.V_cc, self.V_cc, out=out)
+
+    def reset(self):
+        self._prev = None
+
+def make_stage(config_type, R_in, R_f, V_cc, dt, C=1e-6, V_in2=0, R_in2=10000):
+    """
+    The stage for one of the Lab configurations. dt is the sample interval of the signal that
+    will be pushed through it; V_in2 is the DC level on a summing/difference second input.
+    """
+    if config_type == Config.INTEGRATOR:
+        return IntegratorStage(R_in, C, V_cc, dt)
+    elif config_type == Config.DIFFERENTIATOR:
+        return DifferentiatorStage(R_f, C, V_cc, dt)
+    elif config_type in _MEMORYLESS:
+        output = _MEMORYLESS[config_type]
+        return GainStage(output(R_in, R_f, R_in2, 1.0, 0.0), output(R_in, R_f, R_in2, 0.0, V_in2), V_cc)
+    raise ValueError(f"Unknown configuration: {config_type}")
+
+def stage_from_solver(solver, dt):
+    # The stage a configured OpAmpSolver describes
+    return make_stage(solver.config_type, solver.R_in, solver.R_f, solver.V_cc, dt,
+                      C=solver.C, V_in2=solver.V_in2, R_in2=solver.R_in2)
+
+class Pipeline:
+    """
+    Cascaded stages run block by block. Each block goes through every stage in two preallocated
+    ping-pong buffers of block_size samples (small enough to stay in cache), and the last stage
+    writes straight into the output, so no per-stage arrays are allocated however long the signal.
+
+        chain = Pipeline([make_stage("Non-Inverting", 1e3, 9e3, 15, dt), make_stage("Integrator", 1e4, 0, 15, dt)])
+        vout = chain.run(vin)
+    """
+    def __init__(self, stages, block_size=65536):
+        self.stages = list(stages)
+        self.block_size = block_size
+        self._buffers = np.empty((2, block_size))
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
+
+    def process_block(self, x, out=None):
+        """
+        Pushes one block through all stages and returns the result: `out` if given, otherwise a
+        view of an internal buffer that the next block overwrites.
+        """
+        n = len(x)
+        if n > self._buffers.shape[1]:
+            self._buffers = np.empty((2, n))
+        if not self.stages:
+            if out is None:
+                out = self._buffers[0, :n]
+            out[:] = x
+            return out
+        src = x
+        for i, stage in enumerate(self.stages):
+            last = i == len(self.stages) - 1
+            dst = out if last and out is not None else self._buffers[i % 2, :n]
+            stage.process(src, dst)
+            src = dst
+        return src
+
+    def run(self, x, out=None):
+        """
+        Processes a whole signal (an array or memmap, read one block at a time) into `out`,
+        allocated when not given. Stage state continues from any previous call; reset() to restart.
+        """
+        n = len(x)
+        if out is None:
+            out = np.empty(n)
+        for start in range(0, n, self.block_size):
+            stop = min(start + self.block_size, n)
+            self.process_block(x[start:stop], out[start:stop])
+        return out
+
+    def stream(self, blocks):
+        # Generator over output blocks; each is only valid until the next one is produced
+        for block in blocks:
+            yield self.process_block(block)
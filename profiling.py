@@ -0,0 +1,115 @@
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+# Stage timings are appended here as JSON lines (one rerun per line). Setting OPAMP_TIMING_LOG
+# turns logging on for every session, without the debug panel.
+DEFAULT_LOG_PATH = "lab_timings.jsonl"
+ENV_LOG_PATH = os.environ.get("OPAMP_TIMING_LOG")
+
+def append_record(path, record):
+    # One JSON object per line so concurrent sessions can append safely
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+# First render of each page in this process: what a freshly started replica costs a user
+_first_renders = {}
+
+def record_first_render(page, started):
+    """
+    Records the rerun that began at `started` (perf_counter) if it is the first render of `page`
+    in this process, and returns the record; later renders return None.
+    cold=True marks the first page the process served, which also pays for module imports.
+    """
+    if page in _first_renders:
+        return None
+    record = {
+        "event": "first_render",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "page": page,
+        "first_render_ms": (time.perf_counter() - started) * 1e3,
+        "cold": not _first_renders,
+    }
+    _first_renders[page] = record
+    return record
+
+def first_renders():
+    return list(_first_renders.values())
+
+class StageTimer:
+    """
+    Collects per-stage wall time and net allocated-block counts for one script rerun.
+    With trace_memory=True it also records each stage's peak traced bytes (slower).
+
+        timer = StageTimer()
+        with timer.stage("waveforms"):
+            ...
+    """
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.records = []
+        self.started = time.perf_counter()
+        # Only tracing this timer started is stopped again; someone else's is left running
+        self._started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        blocks_before = sys.getallocatedblocks()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            traced_before, _ = tracemalloc.get_traced_memory()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {
+                "stage": name,
+                "wall_ms": (time.perf_counter() - t0) * 1e3,
+                "alloc_blocks": sys.getallocatedblocks() - blocks_before,
+            }
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                record["peak_bytes"] = peak - traced_before
+            self.records.append(record)
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1e3
+
+    def summary(self, **context):
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            **context,
+            "total_ms": self.total_ms(),
+            "stages": self.records,
+        }
+
+    def append_log(self, path=DEFAULT_LOG_PATH, **context):
+        append_record(path, self.summary(**context))
+
+    def stop(self):
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self._started_tracing = False
+
+def start_profile():
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+def profile_report(profiler, sort="cumulative", limit=30):
+    """
+    Stops a profiler from start_profile() and returns the top `limit` entries as text.
+    """
+    profiler.disable()
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+    return out.getvalue()
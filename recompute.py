@@ -0,0 +1,57 @@
+import contextlib
+import io
+
+class RecomputeGraph:
+    """
+    Derived values of the Lab page as a dependency graph. Each node is a function of named
+    inputs (widget values) and of other nodes; get() recomputes a node only when one of its
+    inputs or upstream nodes changed since the value held in `store` (e.g. st.session_state)
+    was computed, so a widget change costs just the nodes downstream of it.
+
+        graph = RecomputeGraph(st.session_state, timer=timer)
+        graph.set_inputs(config_type=config_type, r_in=r_in, ...)
+        graph.node("gain_curve", lambda config_type, r_in, r_f: ..., inputs=["config_type", "r_in", "r_f"])
+        gains = graph.get("gain_curve")
+    """
+    def __init__(self, store, key="recompute_graph", timer=None):
+        if key not in store:
+            store[key] = {}
+        self.cache = store[key] # name -> {"key", "value", "version"}, kept across reruns
+        self.timer = timer
+        self.inputs = {}
+        self.nodes = {}
+        self.recomputed = []
+
+    def set_inputs(self, **values):
+        self.inputs.update(values)
+
+    def node(self, name, func, inputs=(), deps=()):
+        self.nodes[name] = (func, tuple(inputs), tuple(deps))
+
+    def get(self, name):
+        func, inputs, deps = self.nodes[name]
+        upstream = {d: self.get(d) for d in deps}
+        # Node versions stand in for upstream values, which may be large arrays or unhashable
+        key = (tuple(self.inputs[i] for i in inputs), tuple(self.cache[d]["version"] for d in deps))
+        entry = self.cache.get(name)
+        if entry is None or entry["key"] != key:
+            with self.timer.stage(name) if self.timer else contextlib.nullcontext():
+                value = func(**{i: self.inputs[i] for i in inputs}, **upstream)
+            entry = {"key": key, "value": value, "version": entry["version"] + 1 if entry else 0}
+            self.cache[name] = entry
+            self.recomputed.append(name)
+        return entry["value"]
+
+    def clear(self):
+        self.cache.clear()
+
+def figure_png(fig, dpi=200):
+    """
+    Renders a Matplotlib figure to PNG bytes (st.pyplot's defaults) and closes it, so a figure node
+    stores an image that st.image can show again without redrawing.
+    """
+    import matplotlib.pyplot as plt
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", dpi=dpi)
+    plt.close(fig)
+    return buf.getvalue()
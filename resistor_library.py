@@ -0,0 +1,90 @@
+import functools
+
+import numpy as np
+
+# Standard mantissas in the 1.0-9.99 decade
+E12 = [1.0, 1.2, 1.5, 1.8, 2.2, 2.7, 3.3, 3.9, 4.7, 5.6, 6.8, 8.2]
+E24 = [1.0, 1.1, 1.2, 1.3, 1.5, 1.6, 1.8, 2.0, 2.2, 2.4, 2.7, 3.0, 3.3, 3.6, 3.9, 4.3, 4.7, 5.1, 5.6, 6.2, 6.8, 7.5, 8.2, 9.1]
+
+def _precision_series(n):
+    # E48/E96/E192 follow 10^(i/n) rounded to 3 digits, except the standard 9.20 (formula gives 9.19)
+    values = [round(10 ** (i / n), 2) for i in range(n)]
+    return [9.2 if v == 9.19 else v for v in values]
+
+SERIES = {
+    "E12": E12,
+    "E24": E24,
+    "E48": _precision_series(48),
+    "E96": _precision_series(96),
+    "E192": _precision_series(192),
+}
+
+DEFAULT_DECADES = (1, 2, 3, 4, 5, 6) # 10 Ohm ... 9.88 MOhm
+
+@functools.lru_cache(maxsize=None)
+def series_values(series="E24", decades=DEFAULT_DECADES):
+    """
+    Sorted resistor values (Ohms) of an E-series over the given decades (exponent of the
+    multiplier applied to the 1.0-9.99 mantissas, e.g. 3 -> 1k, 1.1k, ...).
+    """
+    if series not in SERIES:
+        raise ValueError(f"Unknown E-series: {series}")
+    values = set()
+    for d in decades:
+        for m in SERIES[series]:
+            # Scale integer mantissas so 1.1 * 100 comes out as exactly 110.0
+            digits = round(m * 100)
+            values.add(digits * 10.0 ** (d - 2) if d >= 2 else digits / 10.0 ** (2 - d))
+    return tuple(sorted(values))
+
+@functools.lru_cache(maxsize=8)
+def _ratio_index(series, decades):
+    # Every (R_in, R_f) pair sorted by log(R_f / R_in), built once per series and decade range
+    values = np.array(series_values(series, decades))
+    log_values = np.log(values)
+    log_ratios = (log_values[None, :] - log_values[:, None]).ravel()
+    order = np.argsort(log_ratios, kind="stable")
+    n = len(values)
+    r_in_idx = (order // n).astype(np.int32)
+    r_f_idx = (order % n).astype(np.int32)
+    return values, log_ratios[order], r_in_idx, r_f_idx
+
+def best_pairs(gain, series="E24", tolerance=0.01, k=5, config_type="Inverting", decades=DEFAULT_DECADES):
+    """
+    Top-k (R_in, R_f) pairs from an E-series whose gain is within `tolerance` (relative) of
+    `gain`. config_type "Inverting" uses |G| = Rf/Rin, "Non-Inverting" uses G = 1 + Rf/Rin.
+    Returns a list of dicts with R_in, R_f, gain and relative error, best first.
+    """
+    if config_type == "Inverting":
+        target_ratio = abs(gain)
+        sign, offset = (-1.0 if gain < 0 else 1.0), 0.0
+    elif config_type == "Non-Inverting":
+        target_ratio = gain - 1
+        sign, offset = 1.0, 1.0
+    else:
+        raise ValueError(f"E-series search supports Inverting and Non-Inverting, not {config_type}")
+    if target_ratio <= 0:
+        raise ValueError(f"Gain {gain} needs Rf/Rin <= 0, which no resistor pair can provide")
+
+    values, log_ratios, r_in_idx, r_f_idx = _ratio_index(series, tuple(decades))
+    target = abs(gain)
+
+    def error(i):
+        return abs(offset + np.exp(log_ratios[i]) - target) / target
+
+    # Bisect, then walk outward taking whichever neighbour is closer: O(log n + k)
+    right = int(np.searchsorted(log_ratios, np.log(target_ratio)))
+    left = right - 1
+    matches = []
+    while len(matches) < k:
+        err_left = error(left) if left >= 0 else np.inf
+        err_right = error(right) if right < len(log_ratios) else np.inf
+        if min(err_left, err_right) > tolerance:
+            break
+        if err_left <= err_right:
+            i, err, left = left, err_left, left - 1
+        else:
+            i, err, right = right, err_right, right + 1
+        r_in, r_f = values[r_in_idx[i]], values[r_f_idx[i]]
+        matches.append({"R_in": float(r_in), "R_f": float(r_f), "gain": float(sign * (offset + r_f / r_in)), "error": float(err)})
+    return matches
@@ -0,0 +1,256 @@
+"""
+Runs recorded signals through an op-amp stage without loading them into memory.
+
+    python signal_io.py capture.wav -o out.wav --config Non-Inverting --R_in 1000 --R_f 9000 --V_cc 12
+    python signal_io.py scope.csv -o out.npy --sample-rate 1e6 --column 1 --config Inverting
+
+WAV (8/16/32-bit PCM, 32/64-bit float) and .npy inputs are memory-mapped and read one block at a
+time; CSV is parsed a block of lines at a time. WAV samples are scaled so digital full scale is
+--full-scale volts; .npy and CSV values are taken as volts. Output is .npy (float64 volts) or WAV
+(32-bit float, volts / full scale, up to the format's 4 GiB limit), written block by block. A JSON
+summary with peak levels, RMS gain and the clipped fraction is printed.
+"""
+import argparse
+import itertools
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+
+from opamp_physics import CONFIG_TYPES, OpAmpSolver
+from pipeline import Pipeline, stage_from_solver
+
+# (format tag, bits per sample) -> (dtype, scale to +/-1, zero offset)
+_WAV_FORMATS = {
+    (1, 8): ("u1", 1 / 128, 128.0),
+    (1, 16): ("<i2", 1 / 2**15, 0.0),
+    (1, 32): ("<i4", 1 / 2**31, 0.0),
+    (3, 32): ("<f4", 1.0, 0.0),
+    (3, 64): ("<f8", 1.0, 0.0),
+}
+
+def _wav_layout(path):
+    # Walks the RIFF chunks: (format tag, channels, sample rate, bits, data offset, data bytes)
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(12)
+        if head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+            raise ValueError(f"Not a WAV file: {path}")
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"No data chunk in {path}")
+            chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if chunk_id == b"fmt ":
+                body = f.read(size + (size & 1))
+                tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                if tag == 0xFFFE and size >= 26: # WAVE_FORMAT_EXTENSIBLE: the real tag opens the sub-format GUID
+                    tag = struct.unpack("<H", body[24:26])[0]
+                fmt = (tag, channels, rate, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"Data before format chunk in {path}")
+                offset = f.tell()
+                # Streamed recordings may leave the size unset; use what is actually there
+                return (*fmt, offset, min(size, file_size - offset))
+            else:
+                f.seek(size + (size & 1), 1)
+
+def open_signal(path, channel=0, column=0, sample_rate=None):
+    """
+    Opens a recorded signal for block reading. Returns a dict with the memory-mapped samples of
+    the chosen channel/column ("data"; None for CSV, which is parsed as it is read), their
+    "scale" and "offset" to volts-per-full-scale, "sample_rate" (from the WAV header, else the
+    argument) and "samples" (None for CSV).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".wav":
+        tag, channels, rate, bits, offset, size = _wav_layout(path)
+        if (tag, bits) not in _WAV_FORMATS:
+            raise ValueError(f"Unsupported WAV encoding: format {tag}, {bits}-bit")
+        dtype, scale, zero = _WAV_FORMATS[(tag, bits)]
+        frames = size // (channels * bits // 8)
+        data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels))[:, channel]
+        return {"path": path, "format": "wav", "data": data, "scale": scale, "offset": zero,
+                "sample_rate": rate, "samples": frames}
+    elif ext == ".npy":
+        data = np.load(path, mmap_mode="r")
+        if data.ndim == 2:
+            data = data[:, channel]
+        return {"path": path, "format": "npy", "data": data, "scale": 1.0, "offset": 0.0,
+                "sample_rate": sample_rate, "samples": len(data)}
+    elif ext in (".csv", ".txt"):
+        return {"path": path, "format": "csv", "data": None, "column": column, "scale": 1.0, "offset": 0.0,
+                "sample_rate": sample_rate, "samples": None}
+    raise ValueError(f"Unsupported signal file: {path}")
+
+def _csv_blocks(path, column, block_size):
+    with open(path) as f:
+        lines = (line for line in f if line.strip())
+        first = next(lines, None)
+        if first is None:
+            return
+        try:
+            float(first.split(",")[column])
+            lines = itertools.chain([first], lines)
+        except ValueError: # Header row
+            pass
+        while True:
+            chunk = list(itertools.islice(lines, block_size))
+            if not chunk:
+                return
+            yield np.loadtxt(chunk, delimiter=",", usecols=column, ndmin=1)
+
+def read_blocks(signal, block_size=65536, full_scale=1.0):
+    """
+    Yields the signal from open_signal() in volts, block_size samples at a time. Blocks are
+    views of one reused buffer, valid until the next block is produced.
+    """
+    buffer = np.empty(block_size)
+    scale = signal["scale"] * full_scale if signal["format"] == "wav" else 1.0
+    if signal["data"] is None:
+        raw_blocks = _csv_blocks(signal["path"], signal["column"], block_size)
+    else:
+        data = signal["data"]
+        raw_blocks = (data[start:start + block_size] for start in range(0, len(data), block_size))
+    for raw in raw_blocks:
+        out = buffer[:len(raw)]
+        np.subtract(raw, signal["offset"], out=out) # Reads the mapped pages, converts to float64
+        if scale != 1.0:
+            out *= scale
+        yield out
+
+class _NpyWriter:
+    # Streams a 1-D float64 .npy; the fixed-size header gets the final length on close
+    HEADER_SIZE = 128
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.file.write(b"\0" * self.HEADER_SIZE)
+        self.count = 0
+
+    def write(self, block):
+        self.file.write(np.ascontiguousarray(block, dtype="<f8").tobytes())
+        self.count += len(block)
+
+    def close(self):
+        header = "{'descr': '<f8', 'fortran_order': False, 'shape': (%d,), }" % self.count
+        header = header.ljust(self.HEADER_SIZE - 10 - 1) + "\n"
+        self.file.seek(0)
+        self.file.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1"))
+        self.file.close()
+
+class _WavWriter:
+    # Streams a mono 32-bit float WAV; the RIFF and data sizes are filled in on close
+    MAX_SAMPLES = (0xFFFFFFFF - 36) // 4 # RIFF sizes are 32-bit: just under 4 GiB of samples
+
+    def __init__(self, path, sample_rate, full_scale=1.0, samples=None):
+        # samples: the expected length when known, so an oversized output fails before writing
+        self.path = path
+        if samples is not None and samples > self.MAX_SAMPLES:
+            raise ValueError(self._too_long(samples))
+        self.file = open(path, "wb")
+        self.sample_rate = int(round(sample_rate))
+        self.full_scale = full_scale
+        self.count = 0
+        self._write_header()
+
+    def _write_header(self):
+        data_bytes = 4 * self.count
+        self.file.write(b"RIFF" + struct.pack("<I", 36 + data_bytes) + b"WAVE")
+        self.file.write(b"fmt " + struct.pack("<IHHIIHH", 16, 3, 1, self.sample_rate, 4 * self.sample_rate, 4, 32))
+        self.file.write(b"data" + struct.pack("<I", data_bytes))
+
+    def _too_long(self, samples):
+        return (f"{self.path}: {samples} samples exceed the WAV size limit of {self.MAX_SAMPLES}; "
+                f"write .npy output instead")
+
+    def write(self, block):
+        if self.count + len(block) > self.MAX_SAMPLES: # Input of unknown length (CSV)
+            raise ValueError(self._too_long(f"at least {self.count + len(block)}"))
+        self.file.write((np.asarray(block) / self.full_scale).astype("<f4").tobytes())
+        self.count += len(block)
+
+    def close(self):
+        self.file.seek(0)
+        self._write_header()
+        self.file.close()
+
+def open_writer(path, sample_rate, full_scale=1.0, samples=None):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        return _NpyWriter(path)
+    elif ext == ".wav":
+        return _WavWriter(path, sample_rate, full_scale, samples)
+    raise ValueError(f"Unsupported output file: {path} (use .npy or .wav)")
+
+def process_file(input_path, output_path, stages, block_size=65536, sample_rate=None, channel=0, column=0,
+                 full_scale=1.0):
+    """
+    Streams a recorded signal through `stages` (a configured OpAmpSolver, a list of pipeline
+    stages or a Pipeline) into output_path, one block at a time. Returns a summary dict:
+    samples, sample_rate, vin_peak, vout_peak, gain_rms and clip_fraction (output at the last
+    stage's rails).
+    """
+    signal = open_signal(input_path, channel=channel, column=column, sample_rate=sample_rate)
+    rate = signal["sample_rate"]
+    if rate is None:
+        raise ValueError(f"sample_rate is required for {signal['format']} input")
+    if isinstance(stages, OpAmpSolver):
+        stages = [stage_from_solver(stages, 1 / rate)]
+    chain = stages if isinstance(stages, Pipeline) else Pipeline(stages, block_size)
+    v_cc = chain.stages[-1].V_cc if chain.stages else np.inf
+
+    count = clipped = 0
+    vin_peak = vout_peak = vin_energy = vout_energy = 0.0
+    writer = open_writer(output_path, rate, full_scale, signal["samples"])
+    try:
+        for block in read_blocks(signal, block_size, full_scale):
+            out = chain.process_block(block)
+            writer.write(out)
+            count += len(block)
+            clipped += int(np.count_nonzero(np.abs(out) >= v_cc))
+            vin_peak = max(vin_peak, float(np.max(np.abs(block))))
+            vout_peak = max(vout_peak, float(np.max(np.abs(out))))
+            vin_energy += float(np.dot(block, block))
+            vout_energy += float(np.dot(out, out))
+    finally:
+        writer.close()
+    return {
+        "samples": count,
+        "sample_rate": rate,
+        "vin_peak": vin_peak,
+        "vout_peak": vout_peak,
+        "gain_rms": float(np.sqrt(vout_energy / vin_energy)) if vin_energy else float("nan"),
+        "clip_fraction": clipped / count if count else 0.0,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a recorded signal through an op-amp stage.")
+    parser.add_argument("input", help=".wav, .npy or .csv signal")
+    parser.add_argument("-o", "--output", required=True, help="output signal (.npy or .wav)")
+    parser.add_argument("--config", default="Inverting", choices=CONFIG_TYPES)
+    parser.add_argument("--R_in", type=float, default=1000.0)
+    parser.add_argument("--R_f", type=float, default=10000.0)
+    parser.add_argument("--V_cc", type=float, default=15.0)
+    parser.add_argument("--C", type=float, default=1e-6)
+    parser.add_argument("--V_in2", type=float, default=0.0, help="DC level on the second input (summing/difference)")
+    parser.add_argument("--R_in2", type=float, default=10000.0)
+    parser.add_argument("--sample-rate", type=float, default=None, help="required for .npy/.csv input")
+    parser.add_argument("--channel", type=int, default=0, help="WAV channel or .npy column")
+    parser.add_argument("--column", type=int, default=0, help="CSV column")
+    parser.add_argument("--full-scale", type=float, default=1.0, help="volts at WAV digital full scale")
+    parser.add_argument("--block-size", type=int, default=65536)
+    args = parser.parse_args(argv)
+
+    solver = OpAmpSolver(args.config, args.R_in, args.R_f, 1.0, args.V_cc, C=args.C, V_in2=args.V_in2, R_in2=args.R_in2)
+    summary = process_file(args.input, args.output, solver, block_size=args.block_size, sample_rate=args.sample_rate,
+                           channel=args.channel, column=args.column, full_scale=args.full_scale)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
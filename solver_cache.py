@@ -0,0 +1,111 @@
+import threading
+from collections import OrderedDict
+
+from opamp_physics import OpAmpSolver, _config
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with hit/miss counters.
+    Bounded by entry count and, when sizeof is given, by total bytes.
+    """
+    def __init__(self, max_entries=256, max_bytes=None, sizeof=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key][0]
+            self.misses += 1
+
+        # Compute outside the lock so slow entries don't block other sessions
+        value = compute()
+        size = self.sizeof(value) if self.sizeof else 0
+
+        with self._lock:
+            if key not in self._data:
+                self._data[key] = (value, size)
+                self.bytes += size
+            self._evict()
+        return value
+
+    def _evict(self):
+        while self._data and (len(self._data) > self.max_entries or
+                              (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            _, (_, size) = self._data.popitem(last=False)
+            self.bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+# Module-level caches live as long as the server process, so every Streamlit session shares them
+_solver_cache = LRUCache(max_entries=1024)
+_waveform_cache = LRUCache(max_entries=128, max_bytes=64 * 1024 * 1024,
+                           sizeof=lambda arrays: sum(a.nbytes for a in arrays))
+
+def _solver_key(config_type, R_in, R_f, V_in, V_cc, A_ol, C, V_in2, R_in2):
+    # Normalize so 1000, 1000.0 and np.float64(1000) share an entry, as do Config members and names
+    return (_config(config_type).value, float(R_in), float(R_f), float(V_in), float(V_cc),
+            float(A_ol), float(C), float(V_in2), float(R_in2))
+
+def cached_solver(config_type, R_in, R_f, V_in, V_cc, A_ol=100000, C=1e-6, V_in2=0, R_in2=10000):
+    """
+    Returns a solved OpAmpSolver shared between callers. Treat it as read-only.
+    """
+    key = _solver_key(config_type, R_in, R_f, V_in, V_cc, A_ol, C, V_in2, R_in2)
+
+    def compute():
+        solver = OpAmpSolver(*key)
+        solver.calculate_parameters()
+        return solver
+
+    return _solver_cache.get_or_compute(key, compute)
+
+def cached_waveforms(config_type, R_in, R_f, V_in, V_cc, A_ol=100000, C=1e-6, V_in2=0, R_in2=10000,
+                     freq=1.0, duration=2.0, points=None, wave_type="Sine"):
+    """
+    Cached OpAmpSolver.generate_waveforms. Returns read-only (t, vin, vout) arrays.
+    """
+    if points is None: # Resolve auto_points first so automatic and explicit grids share entries
+        points = cached_solver(config_type, R_in, R_f, V_in, V_cc, A_ol, C, V_in2, R_in2).auto_points(freq, duration, wave_type)
+    key = _solver_key(config_type, R_in, R_f, V_in, V_cc, A_ol, C, V_in2, R_in2) + \
+        (float(freq), float(duration), int(points), str(wave_type))
+
+    def compute():
+        solver = cached_solver(*key[:9])
+        arrays = solver.generate_waveforms(freq=freq, duration=duration, points=points, wave_type=wave_type)
+        for a in arrays:
+            a.flags.writeable = False
+        return arrays
+
+    return _waveform_cache.get_or_compute(key, compute)
+
+def cache_stats():
+    return {"solver": _solver_cache.stats(), "waveforms": _waveform_cache.stats()}
+
+def clear_caches():
+    _solver_cache.clear()
+    _waveform_cache.clear()
@@ -0,0 +1,93 @@
+import functools
+
+import numpy as np
+
+from opamp_physics import batch_waveforms
+
+# Main-lobe half width (in bins) of each window; harmonic power is summed over the lobe
+WINDOW_HALF_WIDTH = {"rect": 1, "hann": 2, "hamming": 2, "blackman": 3, "blackmanharris": 4}
+
+@functools.lru_cache(maxsize=16)
+def get_window(name, n):
+    if name == "rect":
+        w = np.ones(n)
+    elif name == "hann":
+        w = np.hanning(n)
+    elif name == "hamming":
+        w = np.hamming(n)
+    elif name == "blackman":
+        w = np.blackman(n)
+    elif name == "blackmanharris":
+        # 4-term Blackman-Harris: -92 dB sidelobes, enough to see small harmonics next to the fundamental
+        k = 2 * np.pi * np.arange(n) / (n - 1)
+        w = 0.35875 - 0.48829 * np.cos(k) + 0.14128 * np.cos(2 * k) - 0.01168 * np.cos(3 * k)
+    else:
+        raise ValueError(f"Unknown window: {name}")
+    w.flags.writeable = False
+    return w
+
+def harmonic_analysis(vout, sample_rate, fundamental, n_harmonics=9, window="blackmanharris"):
+    """
+    Harmonic analysis of one or many output waveforms (time on the last axis) via a windowed rfft.
+    Returns a dict with:
+      "freqs", "amplitude": single-sided amplitude spectrum (V)
+      "harmonics": amplitude of the fundamental and its overtones, shape (..., n_harmonics)
+      "thd": sqrt(sum of overtone powers) / fundamental, "thd_db"
+      "sinad_db": fundamental power over everything else except DC
+    """
+    vout = np.asarray(vout, dtype=float)
+    n = vout.shape[-1]
+    w = get_window(window, n)
+    half_width = WINDOW_HALF_WIDTH[window]
+
+    spectrum = np.fft.rfft(vout * w, axis=-1)
+    power = spectrum.real**2 + spectrum.imag**2
+    n_bins = power.shape[-1]
+
+    # Bins around each harmonic k*f0; overtones above Nyquist contribute nothing
+    centers = np.rint(np.arange(1, n_harmonics + 1) * fundamental * n / sample_rate).astype(int)
+    valid = centers + half_width < n_bins
+    lobes = np.clip(centers[:, None] + np.arange(-half_width, half_width + 1), 0, n_bins - 1)
+    lobe_power = np.where(valid, power[..., lobes].sum(axis=-1), 0.0)
+
+    # Lobe power -> sine amplitude: sum |X|^2 over one lobe = N * A^2/4 * sum(w^2)
+    harmonics = np.sqrt(4 * lobe_power / (n * np.sum(w**2)))
+
+    fundamental_power = lobe_power[..., 0]
+    rest_power = power[..., half_width + 1:].sum(axis=-1) - fundamental_power
+    with np.errstate(divide="ignore", invalid="ignore"):
+        thd = np.sqrt(lobe_power[..., 1:].sum(axis=-1) / fundamental_power)
+        thd_db = 20 * np.log10(thd)
+        sinad_db = 10 * np.log10(fundamental_power / np.maximum(rest_power, 0.0))
+
+    return {
+        "freqs": np.fft.rfftfreq(n, d=1 / sample_rate),
+        "amplitude": 2 * np.abs(spectrum) / np.sum(w),
+        "harmonics": harmonics,
+        "thd": thd,
+        "thd_db": thd_db,
+        "sinad_db": sinad_db,
+    }
+
+def clipping_onset(amplitudes, vout, V_cc, rel_tol=1e-9):
+    """
+    Smallest input amplitude whose output reaches the rails (NaN if none does).
+    amplitudes must be sorted ascending and match the leading axis of vout.
+    """
+    clipped = np.max(np.abs(vout), axis=-1) >= V_cc * (1 - rel_tol)
+    return float(np.asarray(amplitudes)[np.argmax(clipped)]) if clipped.any() else float("nan")
+
+def amplitude_sweep(config_type, R_in, R_f, V_cc, amplitudes, C=1e-6, V_in2=0, R_in2=10000,
+                    freq=1.0, wave_type="Sine", periods=16, points=4096, n_harmonics=9, window="blackmanharris"):
+    """
+    Solves every input amplitude in one batched pass and analyses the outputs.
+    Returns the harmonic_analysis dict plus "amplitudes" and "clipping_onset".
+    """
+    amplitudes = np.asarray(amplitudes, dtype=float)
+    duration = periods / freq
+    t, _, vout = batch_waveforms(config_type, R_in, R_f, amplitudes, V_cc, C=C, V_in2=V_in2, R_in2=R_in2,
+                                 freq=freq, duration=duration, points=points, wave_type=wave_type)
+    result = harmonic_analysis(vout, 1 / (t[1] - t[0]), freq, n_harmonics=n_harmonics, window=window)
+    result["amplitudes"] = amplitudes
+    result["clipping_onset"] = clipping_onset(amplitudes, vout, V_cc)
+    return result
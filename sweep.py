@@ -0,0 +1,117 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from opamp_physics import CONFIG_TYPES, _config, solve_batch
+
+# Axes that can be swept, in grid order
+SWEEP_AXES = ["config_type", "R_in", "R_f", "V_cc", "V_in", "C"]
+
+DEFAULT_FIXED = {"config_type": "Inverting", "R_in": 1000.0, "R_f": 10000.0, "V_cc": 15.0, "V_in": 1.0,
+                 "C": 1e-6, "A_ol": 100000.0, "V_in2": 0.0, "R_in2": 10000.0}
+
+DEFAULT_FIELDS = ("V_out", "actual_gain", "beta", "I_in", "I_f")
+
+def _paths(path):
+    base = path[:-4] if path.endswith(".npy") else path
+    return base + ".npy", base + ".tiles.npy", base + ".json"
+
+def _solve_tile(args):
+    # Worker: solve cells [start, stop) of the flattened grid and write them into the shared memmap
+    result_path, manifest, start, stop = args
+    shape = tuple(manifest["shape"])
+    index = np.unravel_index(np.arange(start, stop), shape)
+
+    params = dict(manifest["fixed"])
+    for axis, idx in zip(manifest["axes"], index):
+        values = manifest["values"][axis]
+        if axis == "config_type":
+            params[axis] = np.array([CONFIG_TYPES.index(v) for v in values])[idx]
+        else:
+            params[axis] = np.asarray(values, dtype=float)[idx]
+    solved = solve_batch(**params)
+
+    result = np.load(result_path, mmap_mode="r+")
+    flat = result.reshape(-1, len(manifest["fields"]))
+    for j, field in enumerate(manifest["fields"]):
+        flat[start:stop, j] = solved[field]
+    result.flush()
+    return start // manifest["tile_size"]
+
+def run_sweep(path, axes, fields=DEFAULT_FIELDS, fixed=None, tile_size=1_000_000, workers=None, resume=True):
+    """
+    Evaluates solve_batch over the Cartesian product of `axes` ({axis: values} for any of
+    SWEEP_AXES; other parameters come from `fixed`). Results go to a memory-mapped .npy of shape
+    grid_shape + (len(fields),), written tile by tile by a process pool, so grids larger than
+    RAM work. Finished tiles are recorded next to the result; with resume=True an interrupted
+    run with the same manifest continues where it stopped.
+    Returns the result opened read-only with mmap.
+    """
+    result_path, tiles_path, manifest_path = _paths(path)
+    unknown = [a for a in axes if a not in SWEEP_AXES]
+    if unknown:
+        raise ValueError(f"Cannot sweep {unknown}; choose from {SWEEP_AXES}")
+
+    grid_axes = [a for a in SWEEP_AXES if a in axes]
+    values = {a: [_config(v).value for v in axes[a]] if a == "config_type" else [float(v) for v in axes[a]] for a in grid_axes}
+    shape = [len(values[a]) for a in grid_axes]
+    fixed = {k: v for k, v in {**DEFAULT_FIXED, **(fixed or {})}.items() if k not in grid_axes}
+    if "config_type" in fixed:
+        fixed["config_type"] = _config(fixed["config_type"]).value
+    manifest = {"axes": grid_axes, "values": values, "shape": shape, "fields": list(fields),
+                "fixed": fixed, "tile_size": int(tile_size)}
+
+    n_cells = int(np.prod(shape))
+    n_tiles = -(-n_cells // tile_size)
+
+    existing = None
+    if resume and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            existing = json.load(f)
+    if existing == manifest and os.path.exists(result_path) and os.path.exists(tiles_path):
+        done = np.load(tiles_path, mmap_mode="r+")
+    else:
+        np.lib.format.open_memmap(result_path, mode="w+", dtype=np.float64, shape=tuple(shape) + (len(fields),)).flush()
+        done = np.lib.format.open_memmap(tiles_path, mode="w+", dtype=bool, shape=(n_tiles,))
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f)
+
+    pending = [(result_path, manifest, t * tile_size, min((t + 1) * tile_size, n_cells))
+               for t in np.flatnonzero(~done)]
+
+    def mark(tile):
+        done[tile] = True
+        done.flush()
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for task in pending:
+            mark(_solve_tile(task))
+    else:
+        # Keep a bounded number of tiles in flight; each is marked done as soon as it lands
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tasks = iter(pending)
+            running = set()
+            while True:
+                for task in tasks:
+                    running.add(pool.submit(_solve_tile, task))
+                    if len(running) >= 2 * workers:
+                        break
+                if not running:
+                    break
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    mark(future.result())
+
+    return np.load(result_path, mmap_mode="r")
+
+def load_sweep(path):
+    """
+    Opens a finished or partial sweep: (result memmap, manifest, per-tile done flags).
+    """
+    result_path, tiles_path, manifest_path = _paths(path)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    return np.load(result_path, mmap_mode="r"), manifest, np.load(tiles_path)
@@ -0,0 +1,43 @@
+"""
+Summaries written by run_batch, read back with strict parsers.
+
+    python -m pytest -q test_batch_cli.py
+"""
+import csv
+import json
+
+import pytest
+
+from batch_cli import run_batch
+
+def _strict(constant):
+    raise ValueError(f"Not valid JSON: {constant}")
+
+def _write_configs(path, configs):
+    path.write_text("".join(json.dumps(c) + "\n" for c in configs))
+
+def test_integrator_row_is_strict_json(tmp_path):
+    configs = [
+        {"config_type": "Integrator", "R_in": 10000, "R_f": 100000, "V_cc": 15, "V_in_amp": 1.0, "Wave_Type": "Square"},
+        {"config_type": "Inverting", "R_in": 1000, "R_f": 10000, "V_cc": 15, "V_in_amp": 1.0},
+    ]
+    _write_configs(tmp_path / "in.jsonl", configs)
+    total, errors = run_batch(str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"), workers=1)
+    assert (total, errors) == (2, 0)
+
+    lines = (tmp_path / "out.jsonl").read_text().splitlines()
+    rows = [json.loads(line, parse_constant=_strict) for line in lines]
+    integrator, inverting = rows
+    assert integrator["config_type"] == "Integrator"
+    assert integrator["noise_gain"] is None # 1 / beta with beta = 0
+    assert integrator["beta"] == 0.0 and integrator["vout_pp"] > 0
+    assert inverting["noise_gain"] == pytest.approx(11.0)
+    assert inverting["ideal_gain"] == -10.0
+
+def test_bad_rows_are_reported(tmp_path):
+    _write_configs(tmp_path / "in.jsonl", [{"config_type": "Nope", "R_in": 1, "R_f": 1, "V_cc": 1}])
+    total, errors = run_batch(str(tmp_path / "in.jsonl"), str(tmp_path / "out.csv"), workers=1)
+    assert (total, errors) == (1, 1)
+    with open(tmp_path / "out.csv", newline="") as f:
+        row, = csv.DictReader(f)
+    assert "Unknown configuration" in row["error"]
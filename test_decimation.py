@@ -0,0 +1,68 @@
+"""
+Display decimation: output sizes, end points, and min/max envelopes.
+
+    python -m pytest -q test_decimation.py
+"""
+import numpy as np
+import pytest
+
+from decimation import decimate, lttb, minmax_decimate
+
+def _signal(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 2, n)
+    y = np.clip(12 * np.sin(2 * np.pi * 3 * x), -10, 10) + rng.standard_normal(n)
+    y[n // 3] = 40.0 # Single-sample spikes
+    y[2 * n // 3] = -40.0
+    return x, y
+
+SIZES = [(10, 4), (1000, 5), (1001, 10), (100000, 800), (100003, 801), (12345, 1234), (5000, 4999)]
+
+@pytest.mark.parametrize("method", [minmax_decimate, lttb])
+@pytest.mark.parametrize("n, n_out", SIZES)
+def test_size_and_end_points(method, n, n_out):
+    x, y = _signal(n)
+    xd, yd = method(x, y, n_out)
+    assert len(xd) == len(yd) <= n_out
+    assert (xd[0], yd[0], xd[-1], yd[-1]) == (x[0], y[0], x[-1], y[-1])
+    # A subsequence of the input, in order
+    idx = np.searchsorted(x, xd)
+    assert np.all(np.diff(idx) > 0)
+    np.testing.assert_array_equal(y[idx], yd)
+
+@pytest.mark.parametrize("n, n_out", SIZES)
+def test_lttb_keeps_exactly_n_out(n, n_out):
+    x, y = _signal(n)
+    assert len(lttb(x, y, n_out)[0]) == n_out
+
+@pytest.mark.parametrize("n, n_out", SIZES)
+def test_minmax_envelope(n, n_out):
+    x, y = _signal(n)
+    xd, yd = minmax_decimate(x, y, n_out)
+    assert yd.max() == y.max() == 40.0 and yd.min() == y.min() == -40.0
+    # Every bucket's extremes are kept: (n_out - 2) // 2 buckets of ceil(n / buckets) samples
+    buckets = (n_out - 2) // 2
+    size = -(-n // buckets)
+    kept = np.isin(x, xd)
+    for start in range(0, n, size):
+        bucket = slice(start, start + size)
+        assert y[bucket][kept[bucket]].max() == y[bucket].max()
+        assert y[bucket][kept[bucket]].min() == y[bucket].min()
+
+def test_lttb_keeps_isolated_spikes():
+    x = np.linspace(0, 1, 10000)
+    y = np.zeros_like(x)
+    y[[2500, 7500]] = [5.0, -5.0]
+    yd = lttb(x, y, 100)[1]
+    assert yd.max() == 5.0 and yd.min() == -5.0
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_short_signals_pass_through(method):
+    x, y = _signal(50)
+    xd, yd = decimate(x, y, 50, method)
+    np.testing.assert_array_equal(xd, x)
+    np.testing.assert_array_equal(yd, y)
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        decimate([0, 1], [0, 1], 10, "nearest")
@@ -0,0 +1,81 @@
+"""
+The MNA engine against the closed-form model, and its factorization cache.
+
+    python -m pytest -q test_mna.py
+"""
+import numpy as np
+import pytest
+
+from mna import Circuit, preset, solve_preset
+from opamp_physics import CONFIG_TYPES, solve_batch
+
+FIELDS = ["V_out", "V_plus", "V_minus", "I_in", "I_f"]
+
+# (R_in, R_f, V_cc, A_ol, R_in2): a typical design, a low-gain open loop, a high-gain ideal-ish one
+COMPONENTS = [(1e3, 1e4, 15.0, 1e5, 1e4), (4.7e3, 2.2e3, 5.0, 50.0, 1e3), (100.0, 1e6, 12.0, 1e7, 2.2e5)]
+
+@pytest.mark.parametrize("config_type", CONFIG_TYPES)
+@pytest.mark.parametrize("R_in, R_f, V_cc, A_ol, R_in2", COMPONENTS)
+def test_matches_solve_batch(config_type, R_in, R_f, V_cc, A_ol, R_in2):
+    # A sweep from deep negative saturation through the linear region to positive saturation
+    rng = np.random.default_rng(0)
+    V_in = np.concatenate([np.linspace(-20, 20, 41), rng.uniform(-2, 2, 40)])
+    V_in2 = rng.uniform(-3, 3, V_in.size)
+    mna = solve_preset(config_type, R_in, R_f, V_in, V_cc, A_ol=A_ol, V_in2=V_in2, R_in2=R_in2)
+    closed = solve_batch(config_type, R_in, R_f, V_in, V_cc, A_ol=A_ol, V_in2=V_in2, R_in2=R_in2)
+    if config_type == "Integrator":
+        # At DC the capacitor is open: the output saturates in both models, but (-) follows the
+        # input through R_in instead of the closed form's virtual-ground approximation
+        np.testing.assert_allclose(mna["V_out"], closed["V_out"], rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(mna["V_minus"], V_in, rtol=1e-9, atol=1e-12)
+        assert np.all(mna["I_in"] == 0) and np.all(mna["I_f"] == 0)
+        return
+    for field in FIELDS:
+        np.testing.assert_allclose(mna[field], closed[field], rtol=1e-7, atol=1e-12, err_msg=field)
+
+def test_new_sources_reuse_the_factorization():
+    circuit = Circuit(preset("Inverting", 1e3, 1e4))
+    first = circuit.solve({"V1": 0.5}, V_cc=15)
+    solve = circuit._factors[(None, frozenset())]
+    assert len(circuit._factors) == 1
+
+    # New values, and a whole sweep, are back-substitutions on the same factor
+    second = circuit.solve({"V1": -0.25}, V_cc=15)
+    sweep = circuit.solve({"V1": np.linspace(-1, 1, 11)}, V_cc=15)
+    assert len(circuit._factors) == 1 and circuit._factors[(None, frozenset())] is solve
+    assert first["V"]["out"] == pytest.approx(-5.0, rel=1e-3)
+    assert second["V"]["out"] == pytest.approx(2.5, rel=1e-3)
+    assert sweep["V"]["out"].shape == (11,)
+
+    # Saturation adds one factor with the output pinned, reused by later saturated solves
+    circuit.solve({"V1": 5.0}, V_cc=15)
+    assert len(circuit._factors) == 2
+    pinned = circuit._factors[(None, frozenset({"U1"}))]
+    out = circuit.solve({"V1": [-4.0, 3.0, 0.1]}, V_cc=15)["V"]["out"]
+    assert len(circuit._factors) == 2 and circuit._factors[(None, frozenset({"U1"}))] is pinned
+    np.testing.assert_allclose(out, [15.0, -15.0, -0.99989], rtol=1e-4)
+
+def test_transient_reuses_the_factor_for_the_same_dt():
+    circuit = Circuit(preset("Integrator", 1e4, 0, C=1e-6))
+    dt = 1e-4
+    circuit.transient(dt, {"V1": np.ones(50)})
+    keys = set(circuit._factors)
+    factors = dict(circuit._factors)
+    circuit.transient(dt, {"V1": -np.ones(80)})
+    assert set(circuit._factors) == keys
+    assert all(circuit._factors[k] is factors[k] for k in keys)
+    circuit.transient(dt / 2, {"V1": np.ones(10)})
+    assert len(circuit._factors) == len(keys) + 1
+
+def test_integrator_ramp():
+    # 1 V into R = 10k, C = 1 uF: the output ramps at -1/(RC) = -100 V/s from an uncharged
+    # capacitor; backward Euler is exact for a ramp with an ideal op-amp
+    R, C, dt, steps = 1e4, 1e-6, 1e-4, 100
+    circuit = Circuit(preset("Integrator", R, 0, C=C, A_ol=None))
+    out = circuit.transient(dt, {"V1": np.ones(steps)})["V"]["out"]
+    t = dt * np.arange(1, steps + 1)
+    np.testing.assert_allclose(out, -t / (R * C), rtol=1e-9)
+
+    # The same ramp with rails at +/-0.5 V stops there and stays
+    clipped = circuit.transient(dt, {"V1": np.ones(steps)}, V_cc=0.5)["V"]["out"]
+    np.testing.assert_allclose(clipped, np.maximum(-t / (R * C), -0.5), rtol=1e-9)
@@ -0,0 +1,94 @@
+"""
+Block-wise pipelines: results do not depend on the block size, and a single stage reproduces
+OpAmpSolver.generate_waveforms.
+
+    python -m pytest -q test_pipeline.py
+"""
+import numpy as np
+import pytest
+
+from opamp_physics import OpAmpSolver
+from pipeline import Pipeline, make_stage, stage_from_solver
+
+DT = 1e-5
+
+def _chain(block_size, integrator=True):
+    # Stateful stages on both sides of memoryless ones, with rails that clip along the way
+    stages = [
+        make_stage("Non-Inverting", 1e3, 2e3, 12, DT),
+        make_stage("Integrator", 1e3, 0, 12, DT, C=1e-6),
+        make_stage("Summing Amplifier", 1e3, 1e3, 10, DT, V_in2=0.5, R_in2=2e3),
+        make_stage("Differentiator", 0, 1e3, 12, DT, C=1e-7),
+        make_stage("Inverting", 1e3, 4.7e3, 9, DT),
+    ]
+    return Pipeline(stages if integrator else stages[:1] + stages[2:], block_size)
+
+@pytest.fixture
+def signal():
+    rng = np.random.default_rng(1)
+    t = np.arange(10007) * DT
+    return np.sin(2 * np.pi * 50 * t) + 0.1 * rng.standard_normal(t.size)
+
+BLOCK_SIZES = (1, 7, 256, 4096, 65536)
+
+def test_block_size_invariant(signal):
+    # Without an integrator every sample is computed the same way whatever the blocking
+    reference = _chain(len(signal), integrator=False).run(signal)
+    for block_size in BLOCK_SIZES:
+        np.testing.assert_array_equal(_chain(block_size, integrator=False).run(signal), reference,
+                                      err_msg=str(block_size))
+
+def test_block_size_invariant_with_integrator(signal):
+    # The running sum restarts its cumsum at each block from the carried total, so only the
+    # summation order (last bits) may change
+    reference = _chain(len(signal)).run(signal)
+    for block_size in BLOCK_SIZES:
+        np.testing.assert_allclose(_chain(block_size).run(signal), reference, rtol=0, atol=1e-10,
+                                   err_msg=str(block_size))
+
+def test_process_block_and_stream_carry_state(signal):
+    reference = _chain(len(signal), integrator=False).run(signal)
+    # Uneven blocks pushed one at a time, into the internal buffers and into caller arrays
+    edges = [0, 1, 2, 500, 501, 3000, 9999, len(signal)]
+    chain = _chain(1024, integrator=False)
+    parts = [chain.process_block(signal[a:b]).copy() for a, b in zip(edges, edges[1:])]
+    np.testing.assert_array_equal(np.concatenate(parts), reference)
+
+    chain.reset()
+    out = np.empty_like(signal)
+    for a, b in zip(edges, edges[1:]):
+        chain.process_block(signal[a:b], out[a:b])
+    np.testing.assert_array_equal(out, reference)
+
+    chain.reset()
+    streamed = [block.copy() for block in chain.stream(signal[i:i + 999] for i in range(0, len(signal), 999))]
+    np.testing.assert_array_equal(np.concatenate(streamed), reference)
+
+def _waveforms(config_type, wave_type, **components):
+    solver = OpAmpSolver(config_type, 1e3, 2.2e4, 1.5, 12, **components)
+    t, vin, vout = solver.generate_waveforms(freq=50.0, duration=0.1, points=10001, wave_type=wave_type)
+    return solver, vin, vout, t[1] - t[0]
+
+@pytest.mark.parametrize("config_type", ["Inverting", "Non-Inverting", "Voltage Follower",
+                                         "Summing Amplifier", "Difference Amplifier"])
+@pytest.mark.parametrize("wave_type", ["Sine", "Square", "Triangle"])
+def test_memoryless_stage_matches_generate_waveforms(config_type, wave_type):
+    solver, vin, vout, dt = _waveforms(config_type, wave_type)
+    out = Pipeline([stage_from_solver(solver, dt)], 777).run(vin)
+    np.testing.assert_allclose(out, vout, rtol=1e-12, atol=1e-12)
+
+def test_integrator_stage_matches_generate_waveforms():
+    # generate_waveforms centers the running integral for display; the stage starts uncharged
+    solver, vin, vout, dt = _waveforms("Integrator", "Sine", C=1e-4)
+    out = Pipeline([stage_from_solver(solver, dt)], 777).run(vin)
+    assert np.max(np.abs(vout)) < solver.V_cc # No clipping on either side
+    np.testing.assert_allclose(out - out.mean(), vout, rtol=0, atol=1e-12)
+
+def test_differentiator_stage_matches_generate_waveforms():
+    # Both take a Square's slope as a backward difference of the samples; the stage has no
+    # sample before the first, so its first output is 0
+    solver, vin, vout, dt = _waveforms("Differentiator", "Square", C=1e-9)
+    out = Pipeline([stage_from_solver(solver, dt)], 777).run(vin)
+    assert out[0] == 0
+    np.testing.assert_allclose(out[1:], vout[1:], rtol=1e-9, atol=1e-12)
+    assert np.count_nonzero(out) == np.count_nonzero(vout[1:]) > 0
@@ -0,0 +1,54 @@
+"""
+best_pairs' bisect-and-walk search against a brute-force scan of every E-series pair.
+
+    python -m pytest -q test_resistor_library.py
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from resistor_library import best_pairs, series_values
+
+def _brute_force(gain, series, tolerance, k, config_type):
+    values = np.array(series_values(series))
+    r_in, r_f = np.meshgrid(values, values, indexing="ij")
+    ratio = r_f / r_in
+    achieved = ratio if config_type == "Inverting" else 1 + ratio
+    error = (np.abs(achieved - abs(gain)) / abs(gain)).ravel()
+    keep = np.flatnonzero(error <= tolerance)
+    return np.sort(error[keep])[:k]
+
+CASES = list(itertools.product(
+    [("Inverting", g) for g in (-10.0, 4.7, -3.3333, 1.0, -123.4, 0.02)]
+    + [("Non-Inverting", g) for g in (2.0, 11.0, 1.5, 47.3, 1.01)],
+    ["E12", "E24", "E96"],
+    [(0.01, 5), (0.001, 5), (0.05, 40)],
+))
+
+@pytest.mark.parametrize("target, series, limits", CASES)
+def test_matches_brute_force(target, series, limits):
+    (config_type, gain), (tolerance, k) = target, limits
+    pairs = best_pairs(gain, series=series, tolerance=tolerance, k=k, config_type=config_type)
+    expected = _brute_force(gain, series, tolerance, k, config_type)
+
+    # Same number of matches with the same errors, best first. Pairs with equal ratios tie, and
+    # best_pairs works from log ratios, so exact matches can come out a few ULPs off zero
+    errors = [p["error"] for p in pairs]
+    assert len(errors) == len(expected)
+    np.testing.assert_allclose(errors, expected, rtol=1e-9, atol=1e-12)
+    assert errors == sorted(errors)
+
+    values = set(series_values(series))
+    for p in pairs:
+        assert p["R_in"] in values and p["R_f"] in values
+        ideal = p["R_f"] / p["R_in"] + (config_type == "Non-Inverting")
+        assert p["gain"] == pytest.approx(np.copysign(ideal, gain) if config_type == "Inverting" else ideal)
+        assert p["error"] == pytest.approx(abs(ideal - abs(gain)) / abs(gain), rel=1e-9, abs=1e-12)
+    assert len({(p["R_in"], p["R_f"]) for p in pairs}) == len(pairs)
+
+@pytest.mark.parametrize("gain, config_type", [(1.0, "Non-Inverting"), (0.5, "Non-Inverting"),
+                                               (0.0, "Inverting"), (2.0, "Integrator")])
+def test_unreachable_gains_raise(gain, config_type):
+    with pytest.raises(ValueError):
+        best_pairs(gain, config_type=config_type)
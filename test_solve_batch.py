@@ -0,0 +1,67 @@
+"""
+Parity of the vectorized solve_batch with OpAmpSolver, field by field, for every configuration.
+
+    python -m pytest -q test_solve_batch.py
+"""
+import numpy as np
+import pytest
+
+from opamp_physics import BATCH_FIELDS, CONFIG_TYPES, Config, OpAmpSolver, solve_batch
+
+N = 300
+
+def _random_inputs(seed):
+    # Wide component spreads, inputs large enough to drive the output into the rails, and
+    # open-loop gains down to 1 so the finite-gain terms matter
+    rng = np.random.default_rng(seed)
+    log_uniform = lambda lo, hi: 10 ** rng.uniform(np.log10(lo), np.log10(hi), N)
+    inputs = {
+        "R_in": log_uniform(10, 1e6),
+        "R_f": log_uniform(10, 1e7),
+        "V_in": rng.uniform(-20, 20, N),
+        "V_cc": rng.uniform(1, 18, N),
+        "A_ol": log_uniform(1, 1e7),
+        "C": log_uniform(1e-12, 1e-3),
+        "V_in2": rng.uniform(-20, 20, N),
+        "R_in2": log_uniform(10, 1e6),
+    }
+    # Edges: zero input, exactly at the rail, ideal-ish and unity open-loop gain
+    inputs["V_in"][:4] = [0.0, 0.0, 1.0, -1.0]
+    inputs["V_cc"][2:4] = np.abs(inputs["V_in"][2:4])
+    inputs["A_ol"][4:8] = [1.0, 1.0, 1e12, 1e12]
+    return inputs
+
+def _scalar(config_type, inputs, i):
+    solver = OpAmpSolver(config_type, **{k: float(v[i]) for k, v in inputs.items()})
+    solver.calculate_parameters()
+    return solver
+
+@pytest.mark.parametrize("config_type", CONFIG_TYPES)
+def test_matches_opamp_solver(config_type):
+    inputs = _random_inputs(CONFIG_TYPES.index(config_type))
+    batch = solve_batch(config_type, **inputs)
+    solvers = [_scalar(config_type, inputs, i) for i in range(N)]
+    for field in BATCH_FIELDS:
+        expected = np.array([getattr(s, field) for s in solvers], dtype=float)
+        np.testing.assert_allclose(batch[field], expected, rtol=1e-9, atol=1e-12, equal_nan=True, err_msg=field)
+
+def test_saturation_is_exercised():
+    inputs = _random_inputs(0)
+    v_out = solve_batch("Inverting", **inputs)["V_out"]
+    assert np.any(np.abs(v_out) == inputs["V_cc"]) and np.any(np.abs(v_out) < inputs["V_cc"])
+
+def test_config_forms_agree():
+    # Names, Config members and integer codes (indices into CONFIG_TYPES) select the same solver
+    inputs = _random_inputs(99)
+    codes = np.arange(N) % len(CONFIG_TYPES)
+    by_code = solve_batch(codes, **inputs)
+    by_name = solve_batch(np.array(CONFIG_TYPES)[codes], **inputs)
+    by_member = solve_batch([list(Config)[c] for c in codes], **inputs)
+    for field in BATCH_FIELDS:
+        np.testing.assert_array_equal(by_code[field], by_name[field], err_msg=field)
+        np.testing.assert_array_equal(by_code[field], by_member[field], err_msg=field)
+    for code, config_type in enumerate(CONFIG_TYPES):
+        idx = codes == code
+        single = solve_batch(Config(config_type), **{k: v[idx] for k, v in inputs.items()})
+        for field in BATCH_FIELDS:
+            np.testing.assert_array_equal(by_code[field][idx], single[field], err_msg=field)
@@ -0,0 +1,57 @@
+"""
+Tiled sweeps: an interrupted run resumed from its tile flags equals one uninterrupted run.
+
+    python -m pytest -q test_sweep.py
+"""
+import numpy as np
+import pytest
+
+import sweep
+from sweep import load_sweep, run_sweep
+
+AXES = {"config_type": ["Inverting", "Non-Inverting", "Summing Amplifier"],
+        "R_f": np.logspace(3, 5, 7), "V_in": np.linspace(-2, 2, 9)}
+TILE = 20 # 189 cells -> 10 tiles, the last one partial
+
+class Interrupted(Exception):
+    pass
+
+def test_resume_matches_uninterrupted(tmp_path, monkeypatch):
+    reference = np.array(run_sweep(str(tmp_path / "ref.npy"), AXES, tile_size=TILE, workers=1))
+
+    # Stop after four tiles, as a killed run would
+    solve_tile, calls = sweep._solve_tile, []
+    def failing(task):
+        if len(calls) == 4:
+            raise Interrupted
+        calls.append(task[2])
+        return solve_tile(task)
+    monkeypatch.setattr(sweep, "_solve_tile", failing)
+    with pytest.raises(Interrupted):
+        run_sweep(str(tmp_path / "run.npy"), AXES, tile_size=TILE, workers=1)
+    partial, manifest, done = load_sweep(str(tmp_path / "run.npy"))
+    assert done.tolist() == [True] * 4 + [False] * 6
+    assert manifest["shape"] == [3, 7, 9]
+
+    # Resuming solves only the remaining tiles
+    calls.clear()
+    monkeypatch.setattr(sweep, "_solve_tile", lambda task: calls.append(task[2]) or solve_tile(task))
+    result = run_sweep(str(tmp_path / "run.npy"), AXES, tile_size=TILE, workers=1)
+    assert calls == [t * TILE for t in range(4, 10)]
+    assert load_sweep(str(tmp_path / "run.npy"))[2].all()
+    np.testing.assert_array_equal(result, reference)
+
+def test_changed_manifest_starts_over(tmp_path, monkeypatch):
+    path = str(tmp_path / "run.npy")
+    run_sweep(path, AXES, tile_size=TILE, workers=1)
+    calls = []
+    solve_tile = sweep._solve_tile
+    monkeypatch.setattr(sweep, "_solve_tile", lambda task: calls.append(task[2]) or solve_tile(task))
+    result = run_sweep(path, AXES, fixed={"V_cc": 5.0}, tile_size=TILE, workers=1)
+    assert len(calls) == 10
+    assert np.max(np.abs(result[..., 0])) == 5.0 # V_out now clips at the new rails
+
+def test_process_pool_matches_in_process(tmp_path):
+    serial = run_sweep(str(tmp_path / "a.npy"), AXES, tile_size=TILE, workers=1)
+    pooled = run_sweep(str(tmp_path / "b.npy"), AXES, tile_size=TILE, workers=2)
+    np.testing.assert_array_equal(pooled, serial)
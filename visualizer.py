@@ -1,15 +1,13 @@
-import numpy as np
+import functools
+import math
+import re
 
-def render_dynamic_schematic(state):
+@functools.lru_cache(maxsize=None)
+def _schematic_template(config):
     """
-    Generates a high-quality, publication-ready IEEE schematic.
-    Style: Black & White, Thick Lines, Standard Symbols.
+    The full schematic for one configuration as a str.format template: all geometry is fixed,
+    only the {vin} and {vout} label values change between renders.
     """
-    config = state["config"]
-    vin = state["V_in"]
-    vout = state["V_out"]
-    v_cc = state["V_cc"]
-    
     # Canvas
     width, height = 800, 450
     svg = [f'<svg viewBox="0 0 {width} {height}" width="100%" xmlns="http://www.w3.org/2000/svg" preserveAspectRatio="xMidYMid meet" style="max-height: 450px;">']
@@ -39,8 +37,8 @@ def render_dynamic_schematic(state):
     def resistor(x1, y1, x2, y2, label=""):
         # IEEE Zig-Zag Resistor
         dx, dy = x2 - x1, y2 - y1
-        length = np.sqrt(dx**2 + dy**2)
-        angle = np.degrees(np.arctan2(dy, dx))
+        length = math.hypot(dx, dy)
+        angle = math.degrees(math.atan2(dy, dx))
         
         # Resistor body is 60 units long
         body_len = 60
@@ -102,6 +100,10 @@ def render_dynamic_schematic(state):
         g += '</g>'
         return g
 
+    # Live value slots, filled in by str.format at render time
+    VIN_LABEL = "Vin={vin:.2f}V"
+    VOUT_LABEL = "Vout={vout:.2f}V"
+
     # --- Layout Logic ---
     cx, cy = 400, 225 # Center of OpAmp
     
@@ -122,7 +124,7 @@ def render_dynamic_schematic(state):
     # Output Wire
     p_out_end = (t_out[0] + 100, t_out[1])
     svg.append(line(t_out[0], t_out[1], p_out_end[0], p_out_end[1]))
-    svg.append(terminal(p_out_end[0], p_out_end[1], f"Vout={vout:.2f}V"))
+    svg.append(terminal(p_out_end[0], p_out_end[1], VOUT_LABEL))
     
     # Feedback Network
     # Up from (-), Right, Down to Output
@@ -145,7 +147,7 @@ def render_dynamic_schematic(state):
     if config == "Inverting":
         # Vin -> Rin -> (-)
         p_in = (t_minus[0] - 150, t_minus[1])
-        svg.append(terminal(p_in[0], p_in[1], f"Vin={vin:.2f}V"))
+        svg.append(terminal(p_in[0], p_in[1], VIN_LABEL))
         svg.append(resistor(p_in[0], t_minus[1], t_minus[0], t_minus[1], "Rin"))
         
         # (+) -> Ground
@@ -158,7 +160,7 @@ def render_dynamic_schematic(state):
     elif config == "Non-Inverting":
         # Vin -> (+)
         p_in = (t_plus[0] - 100, t_plus[1])
-        svg.append(terminal(p_in[0], p_in[1], f"Vin={vin:.2f}V"))
+        svg.append(terminal(p_in[0], p_in[1], VIN_LABEL))
         svg.append(line(p_in[0], t_plus[1], t_plus[0], t_plus[1]))
         
         # (-) -> Rin -> Ground
@@ -175,7 +177,7 @@ def render_dynamic_schematic(state):
     elif config == "Voltage Follower":
         # Vin -> (+)
         p_in = (t_plus[0] - 100, t_plus[1])
-        svg.append(terminal(p_in[0], p_in[1], f"Vin={vin:.2f}V"))
+        svg.append(terminal(p_in[0], p_in[1], VIN_LABEL))
         svg.append(line(p_in[0], t_plus[1], t_plus[0], t_plus[1]))
         
         # (-) is connected to feedback loop (already drawn)
@@ -184,3 +186,47 @@ def render_dynamic_schematic(state):
 
     svg.append('</svg>')
     return "".join(svg)
+
+def render_dynamic_schematic(state):
+    """
+    Generates a high-quality, publication-ready IEEE schematic.
+    Style: Black & White, Thick Lines, Standard Symbols.
+    The geometry is built once per configuration; each call only fills in the Vin/Vout labels.
+    """
+    return _schematic_template(state["config"]).format(vin=state["V_in"], vout=state["V_out"])
+
+def render_schematic_batch(config, V_in, V_out):
+    """
+    Schematics for many operating points of one configuration (e.g. solve_batch output):
+    one SVG string per (V_in, V_out) pair.
+    """
+    template = _schematic_template(config)
+    return [template.format(vin=vin, vout=vout) for vin, vout in zip(V_in, V_out)]
+
+@functools.lru_cache(maxsize=None)
+def _animation_parts(config):
+    # Splits the template into static geometry (no live labels) and the label elements alone
+    template = _schematic_template(config)
+    labels = re.findall(r'<text [^>]*>[^<]*\{[^<]*</text>', template)
+    static = re.sub(r'<text [^>]*>[^<]*\{[^<]*</text>', "", template)
+    return static[:-len("</svg>")], "".join(labels)
+
+def render_animated_schematic(config, V_in, V_out, duration=4.0):
+    """
+    One self-contained animated SVG stepping through the (V_in, V_out) operating points.
+    The geometry is drawn once; each frame is a small group of labels that a CSS keyframe
+    animation shows in turn, so the browser plays it with no further server work.
+    """
+    static, labels = _animation_parts(config)
+    n = len(V_in)
+    step = duration / n
+    svg = [static, '<style>'
+           f'.fr{{visibility:hidden;animation:fr {duration}s step-end infinite}}'
+           f'@keyframes fr{{0%{{visibility:visible}}{100 / n:.4f}%{{visibility:hidden}}}}'
+           '</style>']
+    for i, (vin, vout) in enumerate(zip(V_in, V_out)):
+        svg.append(f'<g class="fr" style="animation-delay:{i * step:.4f}s">')
+        svg.append(labels.format(vin=vin, vout=vout))
+        svg.append('</g>')
+    svg.append('</svg>')
+    return "".join(svg)